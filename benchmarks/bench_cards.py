@@ -0,0 +1,87 @@
+"""뉴스 카드 그리기 벤치마크: 카드마다 st.markdown (예전) vs 목록마다 HTML 하나 (news_cards)
+
+    python -m benchmarks.bench_cards [키워드 수,...]
+
+main_4.py와 같은 모양(전체 뉴스 50개 + 키워드마다 10개)을 AppTest로 그려 보고
+rerun 시간과 브라우저로 보내는 요소(델타) 수를 비교합니다.
+"""
+import json
+import statistics
+import sys
+import time
+
+from streamlit.testing.v1 import AppTest
+
+DEFAULT_KEYWORDS = (3, 10, 30)
+RERUNS = 10
+
+
+def dashboard(mode: str, n_keywords: int):
+    # AppTest가 이 함수 본문만 스크립트로 실행하므로 import도 안에서
+    import streamlit as st
+    import news_cards
+    from benchmarks import news_synth
+
+    articles = news_synth.make_articles(400)
+    for i, art in enumerate(articles):
+        art.update(id=str(i), date_ok=0)
+
+    def color_of(source):
+        return "#3b82f6"
+
+    def time_of(art):
+        return art["published"][:16]
+
+    @st.cache_resource
+    def get_renderer():
+        return news_cards.CardRenderer(color_of, time_of)
+
+    def per_card(arts, summary):
+        for art in arts:
+            color = color_of(art["source"])
+            body = (f"<div style=\"margin: 0.3rem 0\">{art['summary'][:120]}</div>" if summary else "")
+            st.markdown(f"""
+            <div class="news-card">
+                <div class="news-title"><a href="{art['link']}" target="_blank">{art['title']}</a></div>
+                {body}
+                <div class="news-meta">
+                    <span class="source-badge" style="background:{color}22; color:{color}">{art['source']}</span>
+                    {time_of(art)}
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+
+    def batched(arts, summary):
+        st.markdown(get_renderer().article_list(arts, summary), unsafe_allow_html=True)
+
+    draw = per_card if mode == "per_card" else batched
+    tab1, tab2 = st.tabs(["전체", "키워드"])
+    with tab1:
+        draw(articles[:50], True)
+    with tab2:
+        for k in range(n_keywords):
+            with st.expander(f"키워드 {k}"):
+                draw(articles[k * 10 % 390:][:10], False)
+
+
+def measure(mode: str, n_keywords: int) -> dict:
+    at = AppTest.from_function(dashboard, args=(mode, n_keywords), default_timeout=60).run()
+    seconds = []
+    for _ in range(RERUNS):
+        t0 = time.perf_counter()
+        at.run()
+        seconds.append(time.perf_counter() - t0)
+    return {"rerun_ms": statistics.median(seconds) * 1000, "elements": len(at.markdown),
+            "cards": sum(m.value.count('class="news-card"') for m in at.markdown)}
+
+
+def main(keyword_counts=DEFAULT_KEYWORDS):
+    report = {}
+    for n in keyword_counts:
+        report[str(n)] = {"per_card": measure("per_card", n), "batched": measure("batched", n)}
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return report
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1].split(",")] if len(sys.argv) > 1 else DEFAULT_KEYWORDS)
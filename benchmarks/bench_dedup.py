@@ -0,0 +1,91 @@
+"""중복 기사 묶기(MinHash + LSH) 벤치마크: 정확도와 기사 수에 따른 시간
+
+    python -m benchmarks.bench_dedup [기사 수,...]
+
+기사마다 1~4개 언론사에 조금씩 다른 사본(단어 몇 개 교체/추가, 요약 길이 차이)을 만들어
+정답 묶음과 비교한 쌍 단위 정밀도/재현율, 그리고 모든 쌍을 비교하는 방식과의 시간 차이를 잽니다.
+news_synth.WORDS(60단어)로는 서로 다른 기사도 글자 3-gram이 대부분 겹치므로
+실제 기사처럼 어휘가 넓도록 임의의 한글 단어 사전을 따로 만들어 씁니다.
+"""
+import itertools
+import json
+import random
+import sys
+import time
+
+import news_text
+SOURCES = ("연합뉴스", "YTN", "KBS", "BBC 코리아", "한겨레")
+VOCAB_SIZE = 5000
+
+
+def make_vocab(rng: random.Random, size: int = VOCAB_SIZE) -> list:
+    """2~4음절 임의 한글 단어"""
+    return ["".join(chr(0xAC00 + rng.randrange(11172)) for _ in range(rng.randint(2, 4)))
+            for _ in range(size)]
+
+
+def make_copies(n_articles: int, seed: int = 0) -> tuple:
+    """(기사 목록, 기사별 정답 이야기 번호)"""
+    rng = random.Random(seed)
+    vocab = make_vocab(rng)
+    articles, truth = [], []
+    for story_id in range(n_articles):
+        story_title = rng.choices(vocab, k=rng.randint(5, 9))
+        story_summary = rng.choices(vocab, k=rng.randint(20, 40))
+        for copy, source in enumerate(rng.sample(SOURCES, rng.randint(1, 4))):
+            title, summary = list(story_title), list(story_summary)
+            if copy:   # 사본은 제목 단어 하나 교체, 요약은 앞부분만 + 단어 하나 추가
+                title[rng.randrange(len(title))] = rng.choice(vocab)
+                summary = summary[:rng.randint(len(summary) * 2 // 3, len(summary))]
+                summary.insert(rng.randrange(len(summary) + 1), rng.choice(vocab))
+            articles.append({"id": f"{story_id}-{copy}", "title": " ".join(title),
+                             "summary": " ".join(summary), "source": source})
+            truth.append(story_id)
+    order = list(range(len(articles)))
+    rng.shuffle(order)
+    return [articles[i] for i in order], [truth[i] for i in order]
+
+
+def pair_scores(groups: list, truth: list) -> dict:
+    predicted = {pair for g in groups for pair in itertools.combinations(sorted(g), 2)}
+    by_story = {}
+    for i, story in enumerate(truth):
+        by_story.setdefault(story, []).append(i)
+    actual = {pair for g in by_story.values() for pair in itertools.combinations(sorted(g), 2)}
+    hit = len(predicted & actual)
+    return {"precision": hit / max(1, len(predicted)), "recall": hit / max(1, len(actual)),
+            "clusters": len(groups), "stories": len(by_story)}
+
+
+def brute_force(clusterer, articles: list) -> float:
+    """모든 쌍의 서명을 비교하는 방식 (O(n²)) 시간만 잼"""
+    sigs = [clusterer.article_signature(a) for a in articles]
+    t0 = time.perf_counter()
+    for i, j in itertools.combinations(range(len(sigs)), 2):
+        (sigs[i] == sigs[j]).mean()
+    return time.perf_counter() - t0
+
+
+def main(sizes=(500, 2000, 8000), seed: int = 0):
+    report = []
+    for n in sizes:
+        articles, truth = make_copies(n, seed)
+        clusterer = news_text.StoryClusterer()
+        t0 = time.perf_counter()
+        for a in articles:
+            clusterer.article_signature(a)
+        signature_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        groups = clusterer.cluster(articles)
+        lsh_s = time.perf_counter() - t0
+        row = {"stories": n, "articles": len(articles), "signature_s": signature_s, "lsh_cluster_s": lsh_s,
+               **pair_scores(groups, truth)}
+        if len(articles) <= 3000:
+            row["all_pairs_s"] = brute_force(clusterer, articles)
+        report.append(row)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return report
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1].split(",")] if len(sys.argv) > 1 else (500, 2000, 8000))
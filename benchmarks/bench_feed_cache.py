@@ -0,0 +1,58 @@
+"""조건부 요청 피드 캐시 벤치마크: 바뀌지 않은 피드를 다시 새로고침할 때의 바이트/CPU
+
+    python -m benchmarks.bench_feed_cache [피드 수] [피드당 기사 수]
+
+로컬 피드 서버에서 (1) 캐시 없이, (2) 빈 디스크 캐시로, (3) 바뀌지 않은 피드를 다시,
+(4) 검증 헤더가 없는 서버에서 다시, (5) 한 피드만 바뀐 뒤 새로고침해서
+서버가 보낸 바이트, 요청 수, 304 수, 클라이언트 CPU 시간을 비교합니다.
+"""
+import json
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import news_feeds
+from benchmarks.feed_server import FeedServer
+
+
+def refresh(server, urls: dict, cache) -> dict:
+    server.reset_counters()
+    outcomes = Counter()
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    for name, url in urls.items():
+        if cache is None:
+            news_feeds.parse_entries(news_feeds.download(url)[2], name)
+            outcomes["miss"] += 1
+        else:
+            outcomes[news_feeds.fetch_feed(url, name, cache)[1]] += 1
+    return {"bytes": server.bytes_sent, "requests": server.requests, "not_modified": server.not_modified,
+            "cpu_ms": (time.process_time() - cpu0) * 1000, "wall_ms": (time.perf_counter() - wall0) * 1000,
+            "outcomes": dict(outcomes)}
+
+
+def main(n_feeds: int = 10, items: int = 200):
+    with FeedServer() as server, tempfile.TemporaryDirectory() as tmp:
+        urls = {f"feed{i}": server.url(f"feed{i}", items=items) for i in range(n_feeds)}
+        plain = {name: url + "&validators=0" for name, url in urls.items()}
+        # max_age=0: 매 새로고침마다 서버에 확인 (5분 안의 새로고침은 요청 자체가 없음)
+        cache = news_feeds.FeedCache(tmp, max_age=0)
+        report = {
+            "feeds": n_feeds,
+            "items_per_feed": items,
+            "no_cache": refresh(server, urls, None),
+            "cold_cache": refresh(server, urls, cache),
+            "unchanged_304": refresh(server, urls, cache),
+        }
+        refresh(server, plain, cache)
+        report["unchanged_no_validators"] = refresh(server, plain, cache)
+        urls["feed0"] = server.url("feed0", items=items, version=1)   # URL은 그대로 두고 내용만 바뀐 것으로
+        cache.put(urls["feed0"], cache.get(server.url("feed0", items=items)))
+        report["one_feed_changed"] = refresh(server, urls, cache)
+        report["fresh_within_max_age"] = refresh(server, urls, news_feeds.FeedCache(tmp))
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return report
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,54 @@
+"""RSS 동시 받기 벤치마크: 순차 루프 vs news_feeds.fetch_all
+
+    python -m benchmarks.bench_fetch [timeout초]
+
+로컬 피드 서버에 피드 10개를 띄우고 피드마다 응답 지연을 줍니다
+(하나는 timeout보다 오래 걸리는 "멈춘" 피드).
+동시 받기는 가장 느린 정상 피드(또는 timeout) 정도에 끝나야 합니다.
+"""
+import json
+import sys
+import time
+
+import news_feeds
+from benchmarks.feed_server import FeedServer
+
+DELAYS = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.8, 1.0, 1.2, 30.0]   # 마지막은 멈춘 피드
+
+
+def main(timeout: float = 2.0):
+    with FeedServer() as server:
+        sources = {f"feed{i}": server.url(f"feed{i}", delay=d) for i, d in enumerate(DELAYS)}
+
+        def fetch(url, name):
+            return news_feeds.fetch_rss(url, name, timeout=timeout)
+
+        t0 = time.perf_counter()
+        sequential = {name: fetch(url, name) for name, url in sources.items()}
+        sequential_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        finished = []
+        concurrent = {}
+        for name, articles in news_feeds.fetch_all(sources, fetch, timeout=timeout):
+            concurrent[name] = articles
+            finished.append((name, round(time.perf_counter() - t0, 3), len(articles)))
+        concurrent_s = time.perf_counter() - t0
+
+    report = {
+        "feeds": len(sources),
+        "delays_s": DELAYS,
+        "timeout_s": timeout,
+        "slowest_ok_feed_s": max(d for d in DELAYS if d < timeout),
+        "sequential_s": sequential_s,
+        "concurrent_s": concurrent_s,
+        "sequential_articles": sum(len(a) for a in sequential.values()),
+        "concurrent_articles": sum(len(a) for a in concurrent.values()),
+        "progress": finished,   # (피드, 끝난 시각, 기사 수) — 끝나는 대로 진행률이 올라감
+    }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return report
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 2.0)
@@ -0,0 +1,88 @@
+"""곡명 유사 검색(초성/오타) 재현율·지연 시간 벤치마크
+
+    python -m benchmarks.bench_fuzzy [곡 수] [질의 수]
+
+가상 곡명에 오타(자모 치환, 글자 삭제, 인접 글자 교환), 부분 곡명, 초성 질의를 만들어
+상위 10개 결과 안에 원래 곡이 들어오는 비율과 질의당 지연 시간을 잽니다.
+"""
+import json
+import random
+import sys
+import time
+
+import numpy as np
+
+import lyrics_search
+from benchmarks import synth
+
+HANGUL_BASE = 0xAC00
+
+
+def jamo_typo(title: str, rng: random.Random) -> str:
+    """한글 음절 하나의 중성이나 종성을 바꿈 (예: 날 → 낧)"""
+    idx = [i for i, ch in enumerate(title) if 0 <= ord(ch) - HANGUL_BASE < 11172]
+    if not idx:
+        return title
+    i = rng.choice(idx)
+    code = ord(title[i]) - HANGUL_BASE
+    cho, jung, jong = code // 588, (code % 588) // 28, code % 28
+    if rng.random() < 0.5:
+        jong = rng.randrange(28)
+    else:
+        jung = rng.randrange(21)
+    return title[:i] + chr(HANGUL_BASE + cho * 588 + jung * 28 + jong) + title[i + 1:]
+
+
+def make_query(title: str, rng: random.Random) -> tuple:
+    kind = rng.choice(["jamo", "delete", "swap", "prefix", "choseong"])
+    if kind == "jamo":
+        return kind, jamo_typo(title, rng)
+    if kind == "delete" and len(title) > 3:
+        i = rng.randrange(len(title))
+        return kind, title[:i] + title[i + 1:]
+    if kind == "swap" and len(title) > 3:
+        i = rng.randrange(len(title) - 1)
+        return kind, title[:i] + title[i + 1] + title[i] + title[i + 2:]
+    if kind == "prefix":
+        return kind, title[:max(2, int(len(title) * 0.6))]
+    return "choseong", lyrics_search.to_choseong(title[:max(2, int(len(title) * 0.7))].replace(" ", ""))
+
+
+def main(n_songs: int = 20000, n_queries: int = 500, seed: int = 0):
+    rng = random.Random(seed)
+    titles = synth.make_frame(n_songs, seed, lines_per_song=(1, 1)) \
+        .drop_duplicates("song_id")["song_name"].tolist()
+    t0 = time.perf_counter()
+    index = lyrics_search.FuzzyIndex(titles)
+    build_s = time.perf_counter() - t0
+
+    normalized = [lyrics_search.normalize_title(t) for t in titles]
+    stats = {}
+    for _ in range(n_queries):
+        target = rng.randrange(len(titles))
+        kind, query = make_query(titles[target], rng)
+        t0 = time.perf_counter()
+        result = index.search(query, limit=10)
+        elapsed = time.perf_counter() - t0
+        hit = any(normalized[p] == normalized[target] for p in result)
+        s = stats.setdefault(kind, {"n": 0, "hits": 0, "latency": []})
+        s["n"] += 1
+        s["hits"] += hit
+        s["latency"].append(elapsed)
+
+    report = {"n_songs": n_songs, "build_s": build_s, "queries": {}}
+    for kind, s in sorted(stats.items()):
+        lat = np.array(s["latency"]) * 1000
+        report["queries"][kind] = {
+            "n": s["n"],
+            "recall_at_10": s["hits"] / s["n"],
+            "p50_ms": float(np.percentile(lat, 50)),
+            "p95_ms": float(np.percentile(lat, 95)),
+            "max_ms": float(lat.max()),
+        }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return report
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,74 @@
+"""관심 키워드 매칭 벤치마크: 키워드마다 filter_by_keyword vs Aho–Corasick 매처
+
+    python -m benchmarks.bench_keywords [키워드 수] [기사 수]
+"""
+import json
+import random
+import sys
+import time
+
+from news_text import KeywordMatcher
+from benchmarks import news_synth
+
+
+def filter_by_keyword(articles: list, keyword: str) -> list:
+    # main_4.py의 기존 함수와 같음 (키워드마다 모든 기사를 소문자로 바꿔 부분 문자열 검사)
+    if not keyword:
+        return articles
+    kw = keyword.lower()
+    return [a for a in articles
+            if kw in a["title"].lower() or kw in a["summary"].lower()]
+
+
+def make_keywords(n: int, rng: random.Random) -> list:
+    """실제로 나오는 단어, 두 단어 구, 나오지 않는 단어를 섞은 키워드 n개"""
+    words = list(news_synth.WORDS)
+    keywords = set(rng.sample(words, min(n // 2, len(words))))
+    while len(keywords) < n * 3 // 4:
+        keywords.add(" ".join(rng.sample(words, 2)))
+    while len(keywords) < n:
+        keywords.add("".join(rng.choices("가나다라마바사아자차카타파하", k=3)))
+    return sorted(keywords)
+
+
+def main(n_keywords: int = 100, n_articles: int = 5000, seed: int = 0):
+    rng = random.Random(seed)
+    articles = news_synth.make_articles(n_articles, seed=seed)
+    for a in articles:
+        a["id"] = a["link"]
+    keywords = make_keywords(n_keywords, rng)
+
+    t0 = time.perf_counter()
+    baseline = {kw: filter_by_keyword(articles, kw) for kw in keywords}
+    baseline_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    matcher = KeywordMatcher(keywords)
+    compile_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    matched = matcher.match(articles)
+    scan_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    matcher.match(articles)   # rerun: 기사별 매치 캐시 사용
+    rerun_s = time.perf_counter() - t0
+
+    assert all(matched[kw] == baseline[kw] for kw in keywords), "결과가 기존 필터와 다름"
+    report = {
+        "keywords": len(keywords),
+        "articles": len(articles),
+        "matches": sum(len(v) for v in baseline.values()),
+        "baseline_s": baseline_s,
+        "compile_s": compile_s,
+        "matcher_first_s": scan_s,
+        "matcher_rerun_s": rerun_s,
+        "speedup_first": baseline_s / (compile_s + scan_s),
+        "speedup_rerun": baseline_s / rerun_s,
+    }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return report
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,73 @@
+"""가사 데이터 로딩 벤치마크: pd.read_csv vs 메모리 맵 Arrow
+
+    python -m benchmarks.bench_load [곡 수]
+
+각 경로를 새 프로세스에서 실행해 콜드 로딩 시간과 메모리(RSS)를 잽니다.
+RssAnon은 프로세스 전용 메모리, RssFile은 파일 페이지(다른 프로세스와 공유 가능)입니다.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks import synth
+
+CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+import pandas as pd
+import lyrics_data
+mode, csv_path, data_dir = sys.argv[1:4]
+t1 = time.perf_counter()
+if mode == "csv":
+    df = pd.read_csv(csv_path)
+else:
+    frames = [lyrics_data.load_frame(p) for p in lyrics_data.list_partitions(data_dir)]
+    df = pd.concat(frames) if len(frames) > 1 else frames[0]
+t2 = time.perf_counter()
+status = {}
+with open("/proc/self/status") as f:
+    for line in f:
+        key, _, value = line.partition(":")
+        if key in ("VmRSS", "RssAnon", "RssFile"):
+            status[key] = int(value.split()[0]) / 1024
+print(json.dumps({"mode": mode, "rows": len(df), "import_s": t1 - t0, "load_s": t2 - t1,
+                  "rss_mb": status.get("VmRSS"), "rss_anon_mb": status.get("RssAnon"),
+                  "rss_file_mb": status.get("RssFile")}))
+"""
+
+
+def run_child(mode: str, csv_path: str, data_dir: str) -> dict:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, "-c", CHILD, mode, csv_path, data_dir],
+                         cwd=root, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def main(n_songs: int = 20000):
+    import lyrics_data
+    import time
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "lyrics.csv")
+        data_dir = os.path.join(tmp, "lyrics")
+        synth.write_csv(csv_path, n_songs)
+        t0 = time.perf_counter()
+        paths = lyrics_data.convert_csv(csv_path, data_dir)
+        convert_s = time.perf_counter() - t0
+
+        results = {
+            "n_songs": n_songs,
+            "csv_mb": os.path.getsize(csv_path) / 1e6,
+            "arrow_mb": sum(os.path.getsize(p) for p in paths) / 1e6,
+            "convert_s": convert_s,
+            "csv": run_child("csv", csv_path, data_dir),
+            "arrow": run_child("arrow", csv_path, data_dir),
+        }
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    return results
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
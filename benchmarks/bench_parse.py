@@ -0,0 +1,64 @@
+"""피드 파싱 벤치마크: feedparser로 전체 파싱 vs 스트리밍 파싱(앞 MAX_ENTRIES개에서 멈춤)
+
+    python -m benchmarks.bench_parse [피드당 항목 수,...]      예) 20,2000,10000
+
+가상 RSS/Atom 문서(요약은 HTML 섞인 100단어)를 64KB 조각으로 흘려 넣어
+파싱 시간, 실제로 읽은 바이트, 최대 메모리(tracemalloc)와 두 결과가 같은지를 비교합니다.
+"""
+import json
+import sys
+import time
+import tracemalloc
+
+import news_feeds
+from benchmarks import news_synth
+
+DEFAULT_ITEMS = (20, 200, 2000)
+SUMMARY_WORDS = 100
+
+
+def chunks(data: bytes, size: int = news_feeds.READ_CHUNK):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+def measure(fn, repeat: int = 3) -> tuple:
+    """(결과, 가장 빠른 시간(ms), 최대 메모리(MB))"""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, best * 1000, peak / 1e6
+
+
+def main(item_counts=DEFAULT_ITEMS):
+    report = {"limit": news_feeds.MAX_ENTRIES, "formats": {}}
+    for fmt, make in (("rss", news_synth.make_rss), ("atom", news_synth.make_atom)):
+        rows = {}
+        for n in item_counts:
+            doc = make(n, seed=n, summary_words=SUMMARY_WORDS)
+            full, full_ms, full_mb = measure(lambda: news_feeds.parse_entries(doc, "bench"))
+            (streamed, read), stream_ms, stream_mb = measure(
+                lambda: news_feeds.parse_stream(chunks(doc), "bench"))
+            rows[str(n)] = {
+                "doc_kb": len(doc) / 1024,
+                "feedparser_ms": full_ms,
+                "feedparser_peak_mb": full_mb,
+                "stream_ms": stream_ms,
+                "stream_peak_mb": stream_mb,
+                "stream_read_kb": read / 1024,
+                "speedup": full_ms / stream_ms,
+                "same_articles": full == streamed,
+            }
+        report["formats"][fmt] = rows
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return report
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1].split(",")] if len(sys.argv) > 1 else DEFAULT_ITEMS)
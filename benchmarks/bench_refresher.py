@@ -0,0 +1,73 @@
+"""백그라운드 새로고침 벤치마크: 동시 접속 세션 수에 따른 페이지 로딩 시간과 외부 요청 수
+
+    python -m benchmarks.bench_refresher [동시 세션 수,...] [피드 지연(초)]
+
+(1) 세션마다 직접 받기: 예전 main_4.py처럼 세션이 선택한 피드를 fetch_all로 받아 저장
+(2) 백그라운드 새로고침: FeedRefresher 하나가 받아 둔 저장소를 세션은 조회만
+두 방식에서 세션 하나가 기사 목록을 얻기까지 걸린 시간과 로컬 피드 서버가 받은 요청 수를 잽니다.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import news_feeds
+import news_store
+from benchmarks.feed_server import FeedServer
+
+N_FEEDS = 10
+SELECTED = 4   # 세션마다 고르는 언론사 수 (main_4.py 기본값)
+
+
+def run_sessions(n_sessions: int, session) -> dict:
+    with ThreadPoolExecutor(max_workers=n_sessions) as pool:
+        seconds = list(pool.map(lambda _: session(), range(n_sessions)))
+    ms = np.array(seconds) * 1000
+    return {"p50_ms": float(np.percentile(ms, 50)), "p95_ms": float(np.percentile(ms, 95))}
+
+
+def main(session_counts=(1, 10, 50), delay: float = 0.5):
+    report = {"feeds": N_FEEDS, "feed_delay_s": delay, "sessions": {}}
+    with FeedServer() as server, tempfile.TemporaryDirectory() as tmp:
+        sources = {f"feed{i}": server.url(f"feed{i}", delay=delay) for i in range(N_FEEDS)}
+        selected = list(sources)[:SELECTED]
+        store = news_store.ArticleStore(os.path.join(tmp, "news.db"))
+
+        def direct_session():
+            t0 = time.perf_counter()
+            fetched = dict(news_feeds.fetch_all({name: sources[name] for name in selected}))
+            store.upsert([a for name in selected for a in fetched[name]])
+            store.query(selected, limit=2000)
+            return time.perf_counter() - t0
+
+        def snapshot_session():
+            t0 = time.perf_counter()
+            store.query(selected, limit=2000)
+            return time.perf_counter() - t0
+
+        refresher = news_feeds.FeedRefresher(sources, store, news_feeds.FeedCache(os.path.join(tmp, "cache")))
+        server.reset_counters()
+        refresher.start().wait_ready(timeout=news_feeds.FETCH_TIMEOUT + 1)
+        report["refresher_startup_requests"] = server.requests
+
+        for n in session_counts:
+            server.reset_counters()
+            direct = run_sessions(n, direct_session)
+            direct["requests"] = server.requests
+            server.reset_counters()
+            snapshot = run_sessions(n, snapshot_session)
+            snapshot["requests"] = server.requests
+            report["sessions"][str(n)] = {"direct_fetch": direct, "shared_refresher": snapshot}
+        refresher.stop()
+        store.close()
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return report
+
+
+if __name__ == "__main__":
+    counts = [int(n) for n in sys.argv[1].split(",")] if len(sys.argv) > 1 else (1, 10, 50)
+    main(counts, *(float(a) for a in sys.argv[2:3]))
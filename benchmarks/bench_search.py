@@ -0,0 +1,206 @@
+"""가사 검색 경로 벤치마크 모음 (Streamlit 없이)
+
+    python -m benchmarks.bench_search [가사 줄 수,...] [결과 JSON 경로]
+
+예)  python -m benchmarks.bench_search 10000,100000,1000000 bench.json
+
+크기마다 같은 스키마의 가상 CSV를 만들고 앱과 같은 경로(LyricsStore)로
+콜드 로딩, 필터 종류별 검색, 필터 조합, 결과 목록 만들기, 상세 보기 시간을 잽니다.
+결과는 버전(git 커밋)과 함께 JSON으로 저장하므로 버전 사이의 회귀를 비교할 수 있습니다.
+"""
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pyarrow.compute as pc
+
+import lyrics_search
+import lyrics_store
+from benchmarks import synth
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_LINES = (10000, 100000, 1000000)
+PAGE_SIZE = 50
+SIMILAR_K = 5
+
+# 새 프로세스에서 저장소를 여는 시간 (파티션/TF-IDF/통계가 이미 디스크에 있는 상태)
+CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+import lyrics_store
+t1 = time.perf_counter()
+data_dir, csv_path, tfidf_path = sys.argv[1:4]
+store = lyrics_store.LyricsStore(data_dir, csv_path, tfidf_path)
+t2 = time.perf_counter()
+print(json.dumps({"import_s": t1 - t0, "open_s": t2 - t1, "songs": len(store.songs)}))
+"""
+
+
+def git_version() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def summarize(seconds: list) -> dict:
+    ms = np.array(seconds) * 1000
+    return {"n": len(ms), "p50_ms": float(np.percentile(ms, 50)),
+            "p95_ms": float(np.percentile(ms, 95)), "max_ms": float(ms.max())}
+
+
+def time_calls(fn, args_list: list) -> dict:
+    seconds = []
+    for args in args_list:
+        t0 = time.perf_counter()
+        fn(*args)
+        seconds.append(time.perf_counter() - t0)
+    return summarize(seconds)
+
+
+def make_queries(store, n: int, rng: random.Random) -> dict:
+    """필터 종류별 질의 (실제 데이터에 있는 값에서 뽑음)"""
+    def pick(field):
+        values = store.filters.values(field) if store.filters.has_field(field) else []
+        return [rng.choice(values) for _ in range(n)] if values else []
+
+    # 키워드는 실제 가사 줄의 단어 하나
+    words = []
+    for _ in range(n):
+        lines = store.songs.lines(rng.randrange(len(store.songs)))
+        words.append(rng.choice(rng.choice(lines).split()))
+    titles = [store.songs.frame["song_name"].iloc[rng.randrange(len(store.songs))] for _ in range(n)]
+
+    def q(conditions, keyword="", fuzzy=False):
+        return lyrics_search.normalize_query(conditions, keyword, fuzzy)
+
+    years, artists = pick("year"), pick("artist")
+    lyricists, arrangers = pick("lyricist"), pick("arranger")
+    single = {
+        "year": [q({"year": v}) for v in years],
+        "artist": [q({"artist": v}) for v in artists],
+        "lyricist": [q({"lyricist": v}) for v in lyricists],
+        "arranger": [q({"arranger": v}) for v in arrangers],
+        "keyword": [q({}, w) for w in words],
+        "fuzzy_title": [q({}, t[:-1], True) for t in titles],
+        "choseong_title": [q({}, lyrics_search.to_choseong(t), True) for t in titles],
+    }
+    combined = {
+        "year+artist": [q({"year": y, "artist": a}) for y, a in zip(years, artists)],
+        "year+keyword": [q({"year": y}, w) for y, w in zip(years, words)],
+        "artist+lyricist": [q({"artist": a, "lyricist": l}) for a, l in zip(artists, lyricists)],
+        "year+arranger+keyword": [q({"year": y, "arranger": r}, w)
+                                  for y, r, w in zip(years, arrangers, words)],
+    }
+    return {"single": {k: v for k, v in single.items() if v},
+            "combined": {k: v for k, v in combined.items() if v}}
+
+
+def render_page(store, positions: np.ndarray, page: int):
+    """앱의 결과 목록: 페이지 슬라이스 → 가벼운 열만 꺼낸 DataFrame"""
+    start = page * PAGE_SIZE
+    return store.songs.take(positions[start:start + PAGE_SIZE])
+
+
+def render_detail(store, position: int):
+    """앱의 상세 보기: 가사 줄 → HTML 문자열 + 비슷한 노래 목록"""
+    html = "<br>".join(store.songs.lines(position))
+    similar, scores = store.similarity.top_k(position, SIMILAR_K)
+    return html, store.songs.take(similar).assign(유사도=scores.round(3))
+
+
+def bench_size(n_lines: int, n_queries: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    n_songs = synth.songs_for_lines(n_lines)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "lyrics.csv")
+        data_dir = os.path.join(tmp, "lyrics")
+        tfidf_path = os.path.join(tmp, "lyrics_tfidf.npz")
+
+        t0 = time.perf_counter()
+        df = synth.write_csv(csv_path, n_songs, seed, n_artists=max(300, n_songs // 10))
+        generate_s = time.perf_counter() - t0
+
+        # 처음 실행: CSV 변환 + 색인 + TF-IDF/통계 생성·저장
+        t0 = time.perf_counter()
+        store = lyrics_store.LyricsStore(data_dir, csv_path, tfidf_path)
+        first_open_s = time.perf_counter() - t0
+
+        cold = json.loads(subprocess.run(
+            [sys.executable, "-c", CHILD, data_dir, csv_path, tfidf_path],
+            cwd=ROOT, capture_output=True, text=True, check=True).stdout)
+
+        queries = make_queries(store, n_queries, rng)
+        result = {
+            "lines": int(pc.sum(pc.list_value_length(
+                store.songs.lyrics_of(np.arange(len(store.songs))))).as_py()),
+            "songs": len(store.songs),
+            "csv_rows": len(df),
+            "csv_mb": os.path.getsize(csv_path) / 1e6,
+            "generate_s": generate_s,
+            "first_open_s": first_open_s,
+            "cold_open": cold,
+            "filters": {},
+            "combined": {},
+        }
+        hits = []
+        for group, key in (("single", "filters"), ("combined", "combined")):
+            for name, qs in queries[group].items():
+                result[key][name] = time_calls(store._search, [(q,) for q in qs])
+                result[key][name]["avg_results"] = float(np.mean([len(store._search(q)) for q in qs]))
+                hits.extend(qs)
+
+        # 캐시 적중 (같은 조건 rerun: 처음 한 번 채운 뒤 바로 다시 검색)
+        def search_twice(q):
+            store.search(q)
+            t0 = time.perf_counter()
+            store.search(q)
+            return time.perf_counter() - t0
+        result["cached"] = summarize([search_twice(q) for q in hits])
+
+        # 결과 목록: 첫 페이지와 임의 페이지
+        page_args = []
+        for q in hits:
+            positions = store.search(q)
+            n_pages = max(1, -(-len(positions) // PAGE_SIZE))
+            page_args.append((store, positions, 0))
+            page_args.append((store, positions, rng.randrange(n_pages)))
+        result["aggregate_page"] = time_calls(render_page, page_args)
+
+        detail_args = [(store, rng.randrange(len(store.songs))) for _ in range(n_queries)]
+        result["detail"] = time_calls(render_detail, detail_args)
+    return result
+
+
+def main(sizes=DEFAULT_LINES, out_path: str = None, n_queries: int = 30, seed: int = 0):
+    report = {
+        "version": git_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "page_size": PAGE_SIZE,
+        "queries_per_type": n_queries,
+        "sizes": {},
+    }
+    for n_lines in sizes:
+        print(f"{n_lines:,}줄 측정 중...", file=sys.stderr)
+        report["sizes"][str(n_lines)] = bench_size(n_lines, n_queries, seed)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if out_path:
+        with open(out_path, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+    return report
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1].split(",")] if len(sys.argv) > 1 else DEFAULT_LINES
+    main(sizes, sys.argv[2] if len(sys.argv) > 2 else None)
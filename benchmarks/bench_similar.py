@@ -0,0 +1,52 @@
+"""비슷한 노래(TF-IDF) 벤치마크: 행렬 생성 시간과 상위 k 질의 지연 시간
+
+    python -m benchmarks.bench_similar [곡 수] [질의 수]
+"""
+import json
+import sys
+import time
+
+import numpy as np
+
+import lyrics_data
+import lyrics_similar
+from benchmarks import synth
+
+
+def main(n_songs: int = 20000, n_queries: int = 200, k: int = 10, seed: int = 0):
+    df = synth.make_frame(n_songs, seed)
+    df["lyrics"] = df["lyrics"].map(lyrics_data.parse_lyrics)
+    songs = lyrics_data.SongTable(df)
+
+    t0 = time.perf_counter()
+    index = lyrics_similar.SimilarityIndex.build(songs)
+    build_s = time.perf_counter() - t0
+
+    rng = np.random.default_rng(seed)
+    queries = rng.integers(0, len(songs), n_queries)
+    single = []
+    for pos in queries:
+        t0 = time.perf_counter()
+        index.top_k(pos, k)
+        single.append(time.perf_counter() - t0)
+    t0 = time.perf_counter()
+    index.top_k_batch(queries, k)
+    batch_s = time.perf_counter() - t0
+
+    single = np.array(single) * 1000
+    report = {
+        "n_songs": len(songs),
+        "vocab": index.matrix.shape[1],
+        "nnz": int(index.matrix.nnz),
+        "build_s": build_s,
+        "query_p50_ms": float(np.percentile(single, 50)),
+        "query_p95_ms": float(np.percentile(single, 95)),
+        "batch_queries": n_queries,
+        "batch_ms_per_query": batch_s * 1000 / n_queries,
+    }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return report
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,90 @@
+"""통계 집계(lyrics_stats) 벤치마크: 지금 데이터의 10배 가상 말뭉치로 집계/로딩/탭 질의 시간
+
+    python -m benchmarks.bench_stats [배율] [기준 곡 수]
+
+기준 곡 수를 주지 않으면 data/lyrics 파티션의 곡 수(없으면 3000곡)를 씁니다.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import lyrics_data
+import lyrics_stats
+from benchmarks import synth
+
+
+def current_songs(data_dir: str = lyrics_data.PARTITION_DIR, default: int = 3000) -> int:
+    ids = [lyrics_data.open_table(p).column("song_id").to_numpy()
+           for p in lyrics_data.list_partitions(data_dir)]
+    return len(np.unique(np.concatenate(ids))) if ids else default
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+def main(scale: int = 10, base_songs: int = None, seed: int = 0):
+    base_songs = base_songs or current_songs()
+    df = synth.make_frame(base_songs * scale, seed, n_artists=300 * scale)
+    df["artist"] = df["artist"].astype("category")
+    df["year"] = df["year"].astype("int16")
+    df["lyrics"] = df["lyrics"].map(lyrics_data.parse_lyrics)
+    for col in lyrics_data.CREDIT_COLUMNS:
+        df[col] = df[col].map(lyrics_data.split_credits)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = os.path.join(tmp, "lyrics")
+        partitions = lyrics_data.write_partitions(df, data_dir)
+        n_lines = int(df["lyrics"].map(len).sum())
+
+        _, full_s = timed(lyrics_stats.ensure_stats, data_dir)
+        # ingest 한 번 = 마지막 연도 파티션 하나만 집계
+        os.remove(lyrics_stats.stats_path(partitions[-1], "words"))
+        built, incremental_s = timed(lyrics_stats.ensure_stats, data_dir)
+        _, noop_s = timed(lyrics_stats.ensure_stats, data_dir)
+        stats_mb = sum(os.path.getsize(os.path.join(lyrics_stats.stats_dir(data_dir), name))
+                       for name in os.listdir(lyrics_stats.stats_dir(data_dir))) / 1e6
+        stats, load_s = timed(lyrics_stats.CorpusStats.load, data_dir)
+
+    # 통계 탭 한 번 그릴 때 쓰는 질의 (집계 테이블만 사용)
+    rng = np.random.default_rng(seed)
+    artists = stats.artists.index.to_numpy()
+    tab = []
+    for _ in range(50):
+        t0 = time.perf_counter()
+        stats.word_trend(stats.top_words.index[:5].tolist())
+        stats.artists.head(100)
+        stats.distinctive_words(artists[rng.integers(len(artists))])
+        tab.append(time.perf_counter() - t0)
+    tab = np.array(tab) * 1000
+
+    report = {
+        "scale": scale,
+        "n_songs": int(df["song_id"].nunique()),
+        "n_rows": len(df),
+        "n_lines": n_lines,
+        "n_partitions": len(partitions),
+        "precompute_full_s": full_s,
+        "precompute_lines_per_s": n_lines / full_s,
+        "precompute_incremental_s": incremental_s,
+        "incremental_partitions": len(built),
+        "precompute_noop_s": noop_s,
+        "stats_mb": stats_mb,
+        "stats_load_s": load_s,
+        "vocab": len(stats.word_rate),
+        "artists": len(stats.artists),
+        "tab_query_p50_ms": float(np.percentile(tab, 50)),
+        "tab_query_p95_ms": float(np.percentile(tab, 95)),
+    }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return report
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
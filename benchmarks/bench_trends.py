@@ -0,0 +1,69 @@
+"""급상승 단어(TrendTracker) 벤치마크: 몇 주치 기사의 메모리와 질의 시간
+
+    python -m benchmarks.bench_trends [주 수] [시간당 기사 수]
+
+마지막 3시간에는 평소에 없던 단어("북상")가 든 기사를 섞어 급상승을 만들고,
+그 단어가 1위로 잡히는지와 질의 시간, 보관 기간을 넘긴 기사가 버려지는지 확인합니다.
+"""
+import json
+import sys
+import time
+import tracemalloc
+
+import news_text
+from benchmarks import news_synth
+
+HOUR = 3600
+
+
+def main(weeks: int = 4, per_hour: int = 60, seed: int = 0):
+    hours = weeks * 7 * 24
+    now = 1767225600 + hours * HOUR
+    articles = news_synth.make_articles(hours * per_hour, seed=seed, step_minutes=1)
+    for i, a in enumerate(articles):
+        a["id"] = a["link"]
+        a["first_seen"] = now - i * HOUR // per_hour
+        if i < 3 * per_hour and i % 3 == 0:
+            a["title"] += " 태풍 북상"
+
+    tracemalloc.start()
+    # 기사별 단어 빈도 캐시는 작게 두어 추적기 자체의 메모리만 재도록 함
+    tokens = news_text.TokenCache(capacity=per_hour * 2)
+    tracker = news_text.TrendTracker(tokens)
+    t0 = time.perf_counter()
+    for start in range(len(articles) - per_hour, -1, -per_hour):   # 오래된 시간부터 한 시간씩
+        tracker.add(articles[start:start + per_hour], now=now)
+    add_s = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    timings = {}
+    for source in (None, "YTN"):
+        t0 = time.perf_counter()
+        top = tracker.trending(3, 72, source, now=now)
+        timings["overall" if source is None else "per_source"] = {
+            "query_ms": (time.perf_counter() - t0) * 1000,
+            "top": [(w, c, round(e, 1), round(s, 1)) for w, c, e, s in top[:5]],
+        }
+    t0 = time.perf_counter()
+    tracker.trending(3, 72, now=now)
+    cached_ms = (time.perf_counter() - t0) * 1000
+
+    report = {
+        "weeks": weeks,
+        "articles": len(articles),
+        "retention_hours": tracker.retention * tracker.bucket_seconds // HOUR,
+        "tracker": tracker.stats(),   # 보관 기간(3주) 밖의 기사는 세지 않음
+        "add_s": add_s,
+        "traced_mb": current / 1e6,
+        "traced_peak_mb": peak / 1e6,
+        "trending": timings,
+        "cached_query_ms": cached_ms,
+    }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return report
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
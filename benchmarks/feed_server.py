@@ -0,0 +1,96 @@
+"""벤치마크용 로컬 RSS 서버 (응답 지연을 주입할 수 있음)
+
+    with FeedServer() as server:
+        url = server.url("ytn", delay=1.5, items=20)
+
+ETag/Last-Modified 조건부 요청에 304로 답하고(validators=0이면 검증 헤더 없이 항상 200),
+version을 바꾸면 내용이 바뀐 피드가 됩니다. 보낸 응답 수와 본문 바이트 수를 셉니다.
+기사 발행 시각은 서버를 띄운 시각부터 5분 간격으로 거슬러 올라갑니다 (실제 피드처럼 최근 기사).
+"""
+import gzip
+import hashlib
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from email.utils import formatdate
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs, urlencode
+
+from benchmarks import news_synth
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        params = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        name = parts.path.rsplit("/", 1)[-1]
+        delay = float(params.get("delay", 0))
+        items = int(params.get("items", 20))
+        version = int(params.get("version", 0))
+        validators = params.get("validators", "1") != "0"
+        body = self.server.feed(name, items, version)
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+        last_modified = formatdate(1767225600 + version * 60, usegmt=True)
+        self.server.requests += 1
+        time.sleep(delay)
+        try:
+            if validators and (self.headers.get("If-None-Match") == etag
+                               or self.headers.get("If-Modified-Since") == last_modified):
+                self.server.not_modified += 1
+                self.send_response(304)
+                self.end_headers()
+                return
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                body = gzip.compress(body)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                self.send_header("Content-Encoding", "gzip")
+            if validators:
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", last_modified)
+            self.end_headers()
+            self.wfile.write(body)
+            self.server.bytes_sent += len(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass   # 클라이언트가 timeout으로 먼저 끊음
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FeedServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _Handler)
+        self.requests = 0
+        self.not_modified = 0
+        self.bytes_sent = 0
+        self._feeds = {}
+        self.started = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    def feed(self, name: str, items: int, version: int = 0) -> bytes:
+        key = (name, items, version)
+        if key not in self._feeds:
+            seed = zlib.crc32(name.encode()) % 1000 + version * 1000
+            self._feeds[key] = news_synth.make_rss(items, title=name, seed=seed, start=self.started)
+        return self._feeds[key]
+
+    def reset_counters(self):
+        self.requests = self.not_modified = self.bytes_sent = 0
+
+    def url(self, name: str, **params) -> str:
+        query = f"?{urlencode(params)}" if params else ""
+        return f"http://{self.server_address[0]}:{self.server_address[1]}/feed/{name}{query}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,77 @@
+"""벤치마크용 가상 뉴스 RSS/Atom/기사 생성기 (main_4.py의 피드/기사 형식)"""
+import random
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from xml.sax.saxutils import escape
+
+WORDS = ("정부 경제 반도체 수출 금리 인상 물가 날씨 태풍 선거 국회 대통령 외교 북한 미국 중국 일본 "
+         "주식 증시 코스피 환율 부동산 아파트 전세 교육 입시 의료 병원 코로나 백신 AI 인공지능 "
+         "ChatGPT 삼성전자 SK하이닉스 배터리 전기차 현대차 야구 축구 손흥민 올림픽 영화 드라마 "
+         "음악 공연 기후 탄소 에너지 원전 스타트업 투자 규제 법원 검찰 경찰 사고 화재 지진").split()
+
+
+def make_title(rng: random.Random) -> str:
+    return " ".join(rng.choices(WORDS, k=rng.randint(4, 9)))
+
+
+def make_summary(rng: random.Random, n_words: int = 40) -> str:
+    return " ".join(rng.choices(WORDS, k=n_words))
+
+
+def make_articles(n: int, sources=("연합뉴스", "YTN", "KBS", "BBC"), seed: int = 0,
+                  start: datetime = None, step_minutes: int = 5) -> list:
+    """main_4.py 기사 dict 목록 (published는 RFC 822 문자열, 최신 기사가 먼저)"""
+    rng = random.Random(seed)
+    start = start or datetime(2026, 1, 1, tzinfo=timezone.utc)
+    articles = []
+    for i in range(n):
+        published = start - timedelta(minutes=step_minutes * i)
+        articles.append({
+            "title": make_title(rng),
+            "link": f"https://news.example.com/{i}",
+            "summary": make_summary(rng)[:200],
+            "published": format_datetime(published),
+            "source": rng.choice(sources),
+        })
+    return articles
+
+
+def make_rss(n_items: int = 20, title: str = "테스트 피드", seed: int = 0,
+             summary_words: int = 40, html_summary: bool = True, start: datetime = None) -> bytes:
+    """RSS 2.0 문서 (요약은 HTML 태그가 섞인 CDATA, 첫 기사의 발행 시각이 start)"""
+    rng = random.Random(seed)
+    start = start or datetime(2026, 1, 1, tzinfo=timezone.utc)
+    items = []
+    for i in range(n_items):
+        summary = make_summary(rng, summary_words)
+        if html_summary:
+            summary = f"<![CDATA[<p><img src=\"https://img.example.com/{i}.jpg\"/>{summary}</p>]]>"
+        else:
+            summary = escape(summary)
+        items.append(
+            f"<item><title>{escape(make_title(rng))}</title>"
+            f"<link>https://news.example.com/{seed}/{i}</link>"
+            f"<description>{summary}</description>"
+            f"<pubDate>{format_datetime(start - timedelta(minutes=5 * i))}</pubDate></item>")
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"><channel>'
+            f"<title>{escape(title)}</title><link>https://news.example.com/</link>"
+            f"<description>{escape(title)}</description>{''.join(items)}</channel></rss>").encode("utf-8")
+
+
+def make_atom(n_items: int = 20, title: str = "테스트 피드", seed: int = 0,
+              summary_words: int = 40, start: datetime = None) -> bytes:
+    """Atom 1.0 문서 (요약은 type="html"로 이스케이프한 HTML)"""
+    rng = random.Random(seed)
+    start = start or datetime(2026, 1, 1, tzinfo=timezone.utc)
+    entries = []
+    for i in range(n_items):
+        summary = f'<p><img src="https://img.example.com/{i}.jpg"/>{make_summary(rng, summary_words)}</p>'
+        updated = (start - timedelta(minutes=5 * i)).isoformat()
+        entries.append(
+            f"<entry><title>{escape(make_title(rng))}</title>"
+            f'<link rel="alternate" href="https://news.example.com/{seed}/{i}"/>'
+            f"<id>urn:news:{seed}:{i}</id><published>{updated}</published><updated>{updated}</updated>"
+            f'<summary type="html">{escape(summary)}</summary></entry>')
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n<feed xmlns="http://www.w3.org/2005/Atom">'
+            f"<title>{escape(title)}</title><id>urn:news:{seed}</id><updated>{start.isoformat()}</updated>"
+            f"{''.join(entries)}</feed>").encode("utf-8")
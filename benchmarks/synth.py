@@ -0,0 +1,49 @@
+"""벤치마크용 가상 가사 데이터 생성기 (data/lyrics_2019_2023.csv와 같은 스키마)"""
+import random
+
+import pandas as pd
+
+SYLLABLES = list("가나다라마바사아자차카타파하사랑너나우리오늘밤별꿈눈물시간기억바람하늘노래마음")
+
+
+def make_artists(n: int, rng: random.Random) -> list:
+    return [f"{rng.choice(SYLLABLES)}{rng.choice(SYLLABLES)} {i}" for i in range(n)]
+
+
+def make_vocab(n: int, rng: random.Random) -> list:
+    return sorted({"".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))) for _ in range(n)})
+
+
+def make_frame(n_songs: int = 2000, seed: int = 0, n_artists: int = 300,
+               lines_per_song=(15, 40), years=range(2019, 2024)) -> pd.DataFrame:
+    """곡 n_songs개, 곡당 1~3행(차트 진입 연도별) 가상 데이터 (작사/편곡 크레딧 포함)"""
+    rng = random.Random(seed)
+    artists = make_artists(n_artists, rng)
+    writers = make_artists(n_artists * 2, rng)
+    vocab = make_vocab(3000, rng)
+    years = list(years)
+    rows = []
+    for song_id in range(1, n_songs + 1):
+        artist = rng.choice(artists)
+        song_name = " ".join(rng.choices(vocab, k=rng.randint(1, 3)))
+        lines = [" ".join(rng.choices(vocab, k=rng.randint(3, 7)))
+                 for _ in range(rng.randint(*lines_per_song))]
+        lyrics = str(lines)
+        lyricist = " / ".join(rng.sample(writers, rng.randint(1, 3)))
+        arranger = " / ".join(rng.sample(writers, rng.randint(1, 2)))
+        first = rng.randrange(len(years))
+        for year in years[first:first + rng.randint(1, 3)]:
+            rows.append((song_id, artist, song_name, year, lyrics, lyricist, arranger))
+    return pd.DataFrame(rows, columns=["song_id", "artist", "song_name", "year", "lyrics",
+                                       "lyricist", "arranger"])
+
+
+def songs_for_lines(n_lines: int, lines_per_song=(15, 40)) -> int:
+    """가사 줄 수 n_lines 정도가 되는 곡 수 (곡당 평균 줄 수로 나눔)"""
+    return max(1, round(n_lines / (sum(lines_per_song) / 2)))
+
+
+def write_csv(path: str, n_songs: int = 2000, seed: int = 0, **kwargs) -> pd.DataFrame:
+    df = make_frame(n_songs, seed, **kwargs)
+    df.to_csv(path, index=False)
+    return df
@@ -0,0 +1,312 @@
+"""가사 데이터 저장소
+
+CSV 원본을 한 번만 연도별 Arrow IPC(열 기반) 파티션 파일로 변환해 두고,
+앱에서는 그 파일들을 메모리 맵으로 열어서 씁니다.
+여러 서버 프로세스가 같은 파일을 열면 OS 페이지 캐시를 함께 쓰므로
+프로세스마다 데이터 사본을 따로 들고 있지 않습니다.
+
+    data/lyrics/year=2019.arrow
+    data/lyrics/year=2020.arrow
+    ...
+
+새 연도는 ingest로 파티션 하나만 추가하고, 기존 파티션은 다시 읽거나 파싱하지 않습니다.
+convert/ingest는 통계 탭용 집계(lyrics_stats)도 함께 만듭니다.
+
+가사는 변환할 때 한 번만 파싱해서 줄 단위 list 열로 저장합니다.
+Arrow의 list 열은 내부적으로 "모든 줄을 이어 붙인 텍스트 버퍼 + 오프셋 배열"이라
+상세 보기는 오프셋으로 바로 잘라 쓰고, 검색은 따옴표/쉼표 없는 깨끗한 텍스트에서 합니다.
+
+변환:  python lyrics_data.py convert [csv경로] [파티션폴더]
+추가:  python lyrics_data.py ingest <csv경로> [파티션폴더]
+검증:  python lyrics_data.py verify [csv경로] [파티션폴더]
+"""
+import ast
+import os
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc as ipc
+
+CSV_PATH = "data/lyrics_2019_2023.csv"
+PARTITION_DIR = "data/lyrics"
+PARTITION_RE = re.compile(r"^year=(\d+)\.arrow$")
+
+# 여러 명이 " / "로 이어진 크레딧 열
+CREDIT_COLUMNS = ("lyricist", "arranger")
+CREDIT_SEP = " / "
+
+
+# ── 변환 ─────────────────────────────────────────────────────
+def split_credits(raw) -> list:
+    """ "A / B, C / D" → ["A", "B, C", "D"] """
+    if not isinstance(raw, str):
+        return []
+    return [name.strip() for name in raw.split(CREDIT_SEP) if name.strip()]
+
+
+def parse_lyrics(raw) -> list:
+    """문자열로 저장된 파이썬 리스트("['...', '...']")를 가사 줄 리스트로 변환"""
+    if not isinstance(raw, str) or not raw:
+        return []
+    try:
+        lines = ast.literal_eval(raw)
+    except (ValueError, SyntaxError):
+        return [raw]
+    if isinstance(lines, (list, tuple)):
+        return [str(line) for line in lines]
+    return [str(lines)]
+
+
+def read_csv(csv_path: str) -> pd.DataFrame:
+    """CSV 읽기 + 정리 (artist 범주형, year 정수, 가사/크레딧은 리스트)"""
+    df = pd.read_csv(csv_path)
+    df["artist"] = df["artist"].astype(str).str.strip().astype("category")
+    df["year"] = df["year"].astype("int16")
+    df["song_name"] = df["song_name"].astype(str)
+    df["lyrics"] = df["lyrics"].map(parse_lyrics)
+    for col in CREDIT_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].map(split_credits)
+    return df
+
+
+def partition_path(year: int, data_dir: str = PARTITION_DIR) -> str:
+    return os.path.join(data_dir, f"year={int(year)}.arrow")
+
+
+def list_partitions(data_dir: str = PARTITION_DIR) -> list:
+    """연도순 파티션 파일 경로 목록"""
+    if not os.path.isdir(data_dir):
+        return []
+    found = []
+    for name in os.listdir(data_dir):
+        m = PARTITION_RE.match(name)
+        if m:
+            found.append((int(m.group(1)), os.path.join(data_dir, name)))
+    return [path for _, path in sorted(found)]
+
+
+def write_table(table: pa.Table, arrow_path: str):
+    # 압축 없이 써야 메모리 맵으로 바로(zero-copy) 읽을 수 있음
+    tmp_path = arrow_path + ".tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, arrow_path)
+
+
+def write_partitions(df: pd.DataFrame, data_dir: str = PARTITION_DIR) -> list:
+    """정리된 DataFrame을 연도별 파티션으로 저장 (연도 안의 행 순서는 유지)"""
+    os.makedirs(data_dir, exist_ok=True)
+    paths = []
+    for year, part in df.groupby("year", sort=True):
+        part = part.assign(artist=part["artist"].cat.remove_unused_categories())
+        table = pa.Table.from_pandas(part, preserve_index=False).replace_schema_metadata(None)
+        path = partition_path(year, data_dir)
+        write_table(table, path)
+        paths.append(path)
+    return paths
+
+
+def convert_csv(csv_path: str = CSV_PATH, data_dir: str = PARTITION_DIR) -> list:
+    """CSV 전체 → 연도별 파티션 (같은 연도 파티션은 덮어씀)"""
+    return write_partitions(read_csv(csv_path), data_dir)
+
+
+def ingest_csv(csv_path: str, data_dir: str = PARTITION_DIR) -> list:
+    """새 연도 CSV → 파티션 추가 (이미 있는 연도는 거부, 기존 파티션은 건드리지 않음)"""
+    df = read_csv(csv_path)
+    existing = [y for y in df["year"].unique() if os.path.exists(partition_path(y, data_dir))]
+    if existing:
+        raise ValueError(f"이미 파티션이 있는 연도: {sorted(int(y) for y in existing)} "
+                         f"(다시 만들려면 convert 사용)")
+    return write_partitions(df, data_dir)
+
+
+def verify(csv_path: str = CSV_PATH, data_dir: str = PARTITION_DIR) -> list:
+    """저장된 가사 줄이 모든 행에서 기존 ast.literal_eval 결과와 같은지 확인
+
+    다른 행의 (행 번호, 원본, 저장값) 목록을 돌려줌 (비어 있으면 통과)
+    """
+    raw = pd.read_csv(csv_path, usecols=["year", "lyrics"])
+    mismatches = []
+    for year, part in raw.groupby("year", sort=True):
+        path = partition_path(year, data_dir)
+        if not os.path.exists(path):
+            mismatches.append((-1, f"{year}년 CSV {len(part)}행", "파티션 없음"))
+            continue
+        stored = open_table(path).column("lyrics").to_pylist()
+        if len(part) != len(stored):
+            mismatches.append((-1, f"{year}년 CSV {len(part)}행", f"Arrow {len(stored)}행"))
+            continue
+        for row, text, lines in zip(part.index, part["lyrics"], stored):
+            if not isinstance(text, str) or not text:
+                expected = []   # 가사가 빈 행(NaN)은 parse_lyrics처럼 빈 목록
+            else:
+                try:
+                    expected = list(ast.literal_eval(text))
+                except (ValueError, SyntaxError):
+                    expected = None
+            if expected != lines:
+                mismatches.append((row, text, lines))
+    return mismatches
+
+
+def ensure_partitions(csv_path: str = CSV_PATH, data_dir: str = PARTITION_DIR) -> list:
+    """파티션이 하나도 없으면 CSV에서 한 번 변환"""
+    if not list_partitions(data_dir) and os.path.exists(csv_path):
+        convert_csv(csv_path, data_dir)
+    return list_partitions(data_dir)
+
+
+# ── 로딩 ─────────────────────────────────────────────────────
+def open_table(arrow_path: str) -> pa.Table:
+    """Arrow 파일을 메모리 맵으로 열기 (버퍼는 파일 페이지를 그대로 참조)"""
+    source = pa.memory_map(arrow_path, "r")
+    return ipc.open_file(source).read_all()
+
+
+def _arrow_dtype(arrow_type):
+    # 문자열/리스트 열은 ArrowDtype으로 두어 파이썬 객체로 복사하지 않음
+    if (pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type)
+            or pa.types.is_list(arrow_type) or pa.types.is_large_list(arrow_type)):
+        return pd.ArrowDtype(arrow_type)
+    return None
+
+
+def load_frame(arrow_path: str) -> pd.DataFrame:
+    """메모리 맵 Arrow 파일 → DataFrame (artist는 Categorical, 가사는 list 열)"""
+    return open_table(arrow_path).to_pandas(types_mapper=_arrow_dtype)
+
+
+def list_array(series: pd.Series) -> pa.Array:
+    """ArrowDtype list 열 → 하나로 합친 pyarrow 배열 (청크가 하나면 복사 없이 그대로)"""
+    arr = pa.array(series.array)
+    if isinstance(arr, pa.ChunkedArray):
+        arr = arr.chunk(0) if arr.num_chunks == 1 else arr.combine_chunks()
+    return arr
+
+
+# ── 곡 단위 테이블 ───────────────────────────────────────────
+class SongTable:
+    """song_id당 한 행으로 미리 묶어 둔 곡 테이블과 행 → 곡 위치 매핑
+
+    CSV에는 한 곡이 (연도별로) 여러 행 들어 있으므로, 로딩할 때 한 번만 묶어 두고
+    검색 결과는 곡 위치(0..곡 수-1) 배열로 다룹니다.
+    곡 위치는 처음 나온 순서로 매기므로 파티션을 추가해도 기존 곡의 위치는 바뀌지 않습니다.
+    가사는 복사해 두지 않고 곡 위치 → (파티션, 행)만 기억해 메모리 맵 파티션에서 바로 꺼냅니다.
+    """
+
+    def __init__(self, df: pd.DataFrame = None):
+        self.song_ids = np.empty(0, dtype=np.int64)
+        self.row_song = np.empty(0, dtype=np.int32)   # (전체 파티션 기준) 행 번호 → 곡 위치
+        self._position = {}                           # song_id → 곡 위치
+        self.song_part = np.empty(0, dtype=np.int32)  # 곡 위치 → 파티션 번호 (append 순서)
+        self.song_row = np.empty(0, dtype=np.int32)   # 곡 위치 → 그 파티션 안의 행 번호
+        self.frame = None
+        self._lyrics = []                             # 파티션별 가사 list 배열 (파일 페이지 참조)
+        if df is not None:
+            self.append(df)
+
+    def append(self, df: pd.DataFrame) -> np.ndarray:
+        """파티션 하나를 추가하고 그 행들의 곡 위치 배열을 돌려줌 (비용은 파티션 크기에 비례)"""
+        ids, first_row, inverse = np.unique(
+            df["song_id"].to_numpy(), return_index=True, return_inverse=True)
+        pos = np.array([self._position.get(i, -1) for i in ids.tolist()], dtype=np.int64)
+        new = np.flatnonzero(pos < 0)
+        new = new[np.argsort(first_row[new], kind="stable")]   # 처음 나온 순서
+        start = len(self.song_ids)
+        pos[new] = np.arange(start, start + len(new))
+        self._position.update(zip(ids[new].tolist(), range(start, start + len(new))))
+        row_song = pos[inverse].astype(np.int32)
+        self.song_ids = np.concatenate([self.song_ids, ids[new]])
+        self.row_song = np.concatenate([self.row_song, row_song])
+
+        # 목록에 보여 줄 가벼운 열만 (가사는 선택한 곡만 따로 꺼냄)
+        # (artist는 일반 문자열로: 범주형이면 페이지마다 전체 가수 사전이 함께 직렬화됨)
+        rows = first_row[new]
+        new_frame = pd.DataFrame({
+            "song_id": ids[new],
+            "artist": df["artist"].astype(str).to_numpy()[rows],
+            "song_name": df["song_name"].astype(str).to_numpy()[rows],
+            "year": df["year"].to_numpy()[rows].astype(np.int16),
+        }).set_index("song_id")
+        self.frame = new_frame if self.frame is None else pd.concat([self.frame, new_frame])
+        if start:
+            # 기존 곡이 이번 파티션에도 있으면 첫 연도만 갱신
+            old = row_song < start
+            years = self.frame["year"].to_numpy().copy()
+            np.minimum.at(years, row_song[old], df["year"].to_numpy()[old])
+            self.frame["year"] = years
+
+        # 가사는 파티션 배열을 그대로 두고 새 곡이 처음 나온 행만 기억
+        self._lyrics.append(list_array(df["lyrics"]))
+        self.song_part = np.concatenate(
+            [self.song_part, np.full(len(new), len(self._lyrics) - 1, dtype=np.int32)])
+        self.song_row = np.concatenate([self.song_row, rows.astype(np.int32)])
+        return row_song
+
+    def __len__(self):
+        return len(self.song_ids)
+
+    def take(self, positions: np.ndarray) -> pd.DataFrame:
+        """곡 위치 배열 → 목록용 DataFrame (artist, song_name, year)"""
+        return self.frame.iloc[positions]
+
+    def lines(self, position: int) -> list:
+        """곡 하나의 가사 줄 (오프셋으로 잘라 냄, 파싱 없음)"""
+        position = int(position)
+        return self._lyrics[self.song_part[position]][int(self.song_row[position])].as_py() or []
+
+    def lyrics_of(self, positions) -> pa.ChunkedArray:
+        """곡 위치 배열 → 같은 순서의 가사 list 배열 (고른 곡만 파티션에서 꺼냄)"""
+        positions = np.asarray(positions, dtype=np.int64)
+        list_type = self._lyrics[0].type if self._lyrics else pa.list_(pa.string())
+        if len(positions) == 0:
+            return pa.chunked_array([], type=list_type)
+        parts = self.song_part[positions]
+        rows = self.song_row[positions]
+        # 같은 파티션이 이어지는 구간마다 take 한 번
+        bounds = np.flatnonzero(np.diff(parts)) + 1
+        starts, ends = np.r_[0, bounds], np.r_[bounds, len(positions)]
+        return pa.chunked_array([self._lyrics[parts[s]].take(pa.array(rows[s:e]))
+                                 for s, e in zip(starts, ends)], type=list_type)
+
+    def texts(self, start: int = 0) -> list:
+        """곡 위치 start부터 곡마다 줄을 \\n으로 이은 텍스트 (색인을 만들 때만 잠깐 씀)"""
+        positions = np.arange(start, len(self))
+        return pc.binary_join(self.lyrics_of(positions), "\n").fill_null("").to_pylist()
+
+    def titles(self, start: int = 0) -> list:
+        return self.frame["song_name"].iloc[start:].tolist()
+
+
+# ── CLI ──────────────────────────────────────────────────────
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command not in ("convert", "ingest", "verify") or (command == "ingest" and len(sys.argv) < 3):
+        print(__doc__)
+        sys.exit(1)
+    src = sys.argv[2] if len(sys.argv) > 2 else CSV_PATH
+    dst = sys.argv[3] if len(sys.argv) > 3 else PARTITION_DIR
+    if command in ("convert", "ingest"):
+        try:
+            paths = convert_csv(src, dst) if command == "convert" else ingest_csv(src, dst)
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+        for path in paths:
+            print(f"{src} → {path} ({os.path.getsize(path) / 1e6:.1f}MB)")
+        # 통계 탭용 집계도 ingest 시점에 함께 만들어 둠
+        import lyrics_stats
+        lyrics_stats.ensure_stats(dst)
+    else:
+        bad = verify(src, dst)
+        for row, text, lines in bad[:10]:
+            print(f"{row}행 불일치: {text[:60]!r} → {lines!r:.60}")
+        print("검증 통과" if not bad else f"불일치 {len(bad)}행")
+        sys.exit(1 if bad else 0)
@@ -0,0 +1,416 @@
+"""가사 검색 인덱스
+
+키워드 검색은 매번 전체 가사를 훑지 않고, 한 번 만들어 둔 역색인(inverted index)에서
+후보 곡을 뽑은 뒤 그 곡들만 실제 문자열 비교로 확인합니다.
+연도/가수 같은 필터도 값마다 곡 위치 목록을 미리 만들어 두고 교집합만 계산합니다.
+곡명 유사 검색은 초성 색인과 자모 trigram 색인으로 후보를 뽑고 편집 거리로 순위를 매깁니다.
+검색 결과(곡 위치 배열)는 정규화한 조건 튜플을 키로 하는 LRU 캐시에 보관해 세션끼리 공유합니다.
+모든 색인은 새 파티션의 곡만 추가(add/append)할 수 있어, 새 연도를 받아도 처음부터 다시 만들지 않습니다.
+"""
+import threading
+from collections import OrderedDict, defaultdict
+
+import numpy as np
+import pandas as pd
+import pyarrow.compute as pc
+
+import lyrics_data
+
+
+# ── 토큰/n-gram ──────────────────────────────────────────────
+def text_grams(text: str) -> set:
+    """공백 토큰마다 음절 bigram을 뽑음 (한 글자 토큰은 그대로 키로 사용)"""
+    grams = set()
+    for token in text.split():
+        if len(token) == 1:
+            grams.add(token)
+        else:
+            grams.update(token[i:i + 2] for i in range(len(token) - 1))
+    return grams
+
+
+def merge_postings(postings: dict, new: dict):
+    """포스팅 dict에 새 포스팅을 합침 (새 곡 위치가 뒤에 붙으므로 대부분 이어 붙이기)"""
+    for key, plist in new.items():
+        old = postings.get(key)
+        if old is None:
+            postings[key] = plist
+        elif len(old) == 0 or len(plist) == 0 or old[-1] < plist[0]:
+            postings[key] = np.concatenate([old, plist])
+        else:
+            postings[key] = np.union1d(old, plist).astype(np.int32)
+
+
+def intersect(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """두 정렬된 배열의 교집합, 비용은 O(len(a) log len(b))"""
+    if len(a) > len(b):
+        a, b = b, a
+    if len(a) == 0:
+        return a
+    pos = np.searchsorted(b, a).clip(max=len(b) - 1)
+    return a[b[pos] == a]
+
+
+# ── 역색인 ───────────────────────────────────────────────────
+class KeywordIndex:
+    """가사 키워드 검색용 음절 bigram 역색인 (포스팅 = 정렬된 곡 위치 배열)
+
+    가사 텍스트는 들고 있지 않고, 후보 확인은 songs(lyrics_data.SongTable)의
+    메모리 맵 가사 list 열에서 후보 곡만 꺼내 pyarrow로 합니다.
+    """
+
+    def __init__(self, songs, texts=()):
+        self.songs = songs
+        self.n_songs = 0
+        self.postings = {}
+        # 한 글자 검색어용: 글자 → 그 글자를 포함하는 키 목록
+        self.char_keys = defaultdict(list)
+        self.add(texts)
+
+    def add(self, texts: list):
+        """곡 위치 n_songs부터 새 곡들의 가사를 색인에 추가 (texts는 색인만 만들고 버림)"""
+        start = self.n_songs
+        lists = defaultdict(list)
+        for pos, text in enumerate(texts, start):
+            for gram in text_grams(text):
+                lists[gram].append(pos)
+        # 다른 세션이 읽는 중일 수 있으므로 곡 수를 먼저 늘리고 포스팅은 나중에 합침
+        self.n_songs = start + len(texts)
+        for gram in lists:
+            if gram not in self.postings:
+                for ch in set(gram):
+                    self.char_keys[ch].append(gram)
+        merge_postings(self.postings, {g: np.array(p, dtype=np.int32) for g, p in lists.items()})
+
+    def _token_candidates(self, token: str) -> np.ndarray:
+        if len(token) == 1:
+            keys = self.char_keys.get(token, [])
+            if not keys:
+                return np.empty(0, dtype=np.int32)
+            return np.unique(np.concatenate([self.postings[k] for k in keys]))
+        result = None
+        # 포스팅이 짧은 bigram부터 교집합
+        lists = sorted((self.postings.get(g, np.empty(0, dtype=np.int32))
+                        for g in {token[i:i + 2] for i in range(len(token) - 1)}), key=len)
+        for plist in lists:
+            result = plist if result is None else intersect(result, plist)
+            if len(result) == 0:
+                break
+        return result
+
+    def candidates(self, keyword: str) -> np.ndarray:
+        """포스팅 교집합으로 얻은 후보 곡 위치 (아직 확인 전)"""
+        result = None
+        for token in sorted(set(keyword.split()), key=len, reverse=True):
+            cand = self._token_candidates(token)
+            result = cand if result is None else intersect(result, cand)
+            if len(result) == 0:
+                break
+        return result if result is not None else np.empty(0, dtype=np.int32)
+
+    def search_positions(self, keyword: str) -> np.ndarray:
+        """keyword를 실제로 포함하는 곡 위치 (정렬됨)"""
+        keyword = keyword.strip()
+        if not keyword:
+            return np.arange(self.n_songs, dtype=np.int32)
+        cand = self.candidates(keyword)
+        if len(cand) == 0:
+            return cand.astype(np.int32)
+        joined = pc.binary_join(self.songs.lyrics_of(cand), "\n")
+        found = pc.match_substring(joined, keyword).fill_null(False)
+        return cand[np.asarray(found, dtype=bool)].astype(np.int32)
+
+
+# ── 필터 엔진 ────────────────────────────────────────────────
+def build_postings(values, song_of_value: np.ndarray, n_songs: int) -> dict:
+    """값 배열과 각 값이 속한 곡 위치 → {값: 그 값을 가진 곡 위치(정렬, 중복 없음)}"""
+    codes, uniques = pd.factorize(values)
+    valid = codes >= 0
+    keys = np.unique(codes[valid].astype(np.int64) * n_songs + song_of_value[valid])
+    key_codes = keys // n_songs
+    positions = (keys % n_songs).astype(np.int32)
+    bounds = np.searchsorted(key_codes, np.arange(len(uniques) + 1))
+    return {value: positions[bounds[i]:bounds[i + 1]]
+            for i, value in enumerate(uniques.tolist())}
+
+
+class FilterIndex:
+    """필드별 값 → 곡 위치 포스팅 목록. 조건 조합은 짧은 목록부터 교집합
+
+    문자열 쿼리를 만들거나 평가하지 않으므로 따옴표가 든 가수명도 그대로 찾고,
+    비용은 전체 행 수가 아니라 가장 짧은 포스팅 길이에 비례합니다.
+    """
+
+    def __init__(self, n_songs: int = 0):
+        self.n_songs = n_songs
+        self.fields = {}
+
+    def append(self, df: pd.DataFrame, row_song: np.ndarray, n_songs: int) -> "FilterIndex":
+        """파티션 하나(행 단위 df와 그 행들의 곡 위치)를 색인에 추가"""
+        self.n_songs = n_songs
+        self.add_field("year", df["year"].to_numpy(), row_song)
+        self.add_field("artist", df["artist"].astype(str).str.strip().to_numpy(), row_song)
+        for col in lyrics_data.CREDIT_COLUMNS:
+            if col in df.columns:
+                self.add_list_field(col, df[col], row_song)
+        return self
+
+    def add_field(self, name: str, values, row_song: np.ndarray):
+        merge_postings(self.fields.setdefault(name, {}),
+                       build_postings(values, row_song, self.n_songs))
+
+    def add_list_field(self, name: str, lists: pd.Series, row_song: np.ndarray):
+        """행마다 여러 값(list 열)을 가진 필드, 예: 작사가/편곡가 크레딧"""
+        arr = lyrics_data.list_array(lists)
+        values = pc.list_flatten(arr).to_numpy(zero_copy_only=False)
+        parents = pc.list_parent_indices(arr).to_numpy()
+        self.add_field(name, values, row_song[parents])
+
+    def has_field(self, name: str) -> bool:
+        return name in self.fields
+
+    def values(self, name: str) -> list:
+        return sorted(self.fields[name])
+
+    def lookup(self, name: str, value) -> np.ndarray:
+        return self.fields[name].get(value, np.empty(0, dtype=np.int32))
+
+    def select(self, conditions: dict, *extra: np.ndarray) -> np.ndarray:
+        """conditions({필드: 값}, 값이 None이면 무시)와 extra 위치 배열의 교집합"""
+        lists = [self.lookup(name, value) for name, value in conditions.items()
+                 if value is not None]
+        lists.extend(extra)
+        if not lists:
+            return np.arange(self.n_songs, dtype=np.int32)
+        lists.sort(key=len)
+        result = lists[0]
+        for plist in lists[1:]:
+            if len(result) == 0:
+                break
+            result = intersect(result, plist)
+        return result
+
+
+# ── 곡명 유사 검색 (초성 / 오타) ─────────────────────────────
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ",
+             "ㄿ", "ㅀ", "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+CONSONANTS = set(CHOSEONG) | set("".join(JONGSEONG))
+HANGUL_BASE, HANGUL_LAST = 0xAC00, 0xD7A3
+
+
+def normalize_title(text: str) -> str:
+    return "".join(text.lower().split())
+
+
+def to_choseong(text: str) -> str:
+    """한글 음절을 초성으로 바꿈 (그 밖의 글자는 그대로)"""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            out.append(CHOSEONG[(code - HANGUL_BASE) // 588])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def to_jamo(text: str) -> str:
+    """한글 음절을 초성/중성/종성 자모로 풀어 씀 (오타가 자모 하나 차이로 보이게)"""
+    out = []
+    for ch in text:
+        code = ord(ch) - HANGUL_BASE
+        if 0 <= code <= HANGUL_LAST - HANGUL_BASE:
+            out.append(CHOSEONG[code // 588])
+            out.append(JUNGSEONG[(code % 588) // 28])
+            out.append(JONGSEONG[code % 28])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def is_choseong_query(query: str) -> bool:
+    query = normalize_title(query)
+    return bool(query) and all(ch in CONSONANTS for ch in query)
+
+
+def substring_distance(query: str, text: str) -> int:
+    """query와 text의 가장 비슷한 부분 문자열 사이의 편집 거리 (부분 곡명 + 오타 허용)
+
+    Myers의 비트 병렬 근사 문자열 매칭: text 길이에 비례하는 정수 연산만 씀
+    """
+    m = len(query)
+    if m == 0:
+        return 0
+    peq = {}
+    for i, ch in enumerate(query):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    mask = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv, mv = mask, 0
+    score = best = m
+    for ch in text:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        # 시작 위치가 자유로우므로 맨 아래 비트를 채우지 않음
+        ph = (ph << 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+        if score < best:
+            best = score
+    return best
+
+
+def _grams(text: str, n: int) -> set:
+    padded = "$" + text + "$"
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+def _postings(strings: list, n: int, start: int = 0) -> dict:
+    lists = defaultdict(list)
+    for pos, text in enumerate(strings, start):
+        for gram in _grams(text, n):
+            lists[gram].append(pos)
+    return {g: np.array(p, dtype=np.int32) for g, p in lists.items()}
+
+
+class FuzzyIndex:
+    """곡명 유사 검색 색인
+
+    - 초성 검색("ㅂㅌㅅ"): 곡명 초성 문자열의 bigram 색인으로 후보를 뽑고 부분 문자열 확인
+    - 오타/부분 곡명: 자모로 푼 곡명의 trigram 색인에서 공유 trigram이 많은 후보를 뽑고
+      부분 문자열 편집 거리로 순위를 매김
+    """
+
+    def __init__(self, titles=(), max_candidates: int = 200):
+        self.max_candidates = max_candidates
+        self.titles = []
+        self.lengths = np.empty(0, dtype=np.int32)
+        self.choseong = []
+        self.jamo = []
+        self.choseong_postings = {}
+        self.jamo_postings = {}
+        self.add(titles)
+
+    def add(self, titles: list):
+        """곡 위치 len(self.titles)부터 새 곡명들을 색인에 추가"""
+        start = len(self.titles)
+        normalized = [normalize_title(t) for t in titles]
+        choseong = [to_choseong(t) for t in normalized]
+        jamo = [to_jamo(t) for t in normalized]
+        self.titles.extend(titles)
+        self.choseong.extend(choseong)
+        self.jamo.extend(jamo)
+        self.lengths = np.concatenate(
+            [self.lengths, np.array([len(t) for t in normalized], dtype=np.int32)])
+        merge_postings(self.choseong_postings, _postings(choseong, 2, start))
+        merge_postings(self.jamo_postings, _postings(jamo, 3, start))
+
+    def _choseong_search(self, query: str, limit: int) -> np.ndarray:
+        if len(query) == 1:
+            # 한 글자는 그 글자를 포함하는 모든 bigram의 합집합
+            lists = [plist for key, plist in self.choseong_postings.items() if query in key]
+            cand = np.unique(np.concatenate(lists)) if lists else np.empty(0, dtype=np.int32)
+        else:
+            lists = sorted((self.choseong_postings.get(g, np.empty(0, dtype=np.int32))
+                            for g in {query[i:i + 2] for i in range(len(query) - 1)}), key=len)
+            cand = lists[0]
+            for plist in lists[1:]:
+                cand = intersect(cand, plist)
+        hits = [(self.choseong[p].find(query), self.lengths[p], p) for p in cand]
+        hits = sorted(h for h in hits if h[0] >= 0)
+        return np.array([p for _, _, p in hits[:limit]], dtype=np.int32)
+
+    def _typo_search(self, query: str, limit: int) -> np.ndarray:
+        q = to_jamo(query)
+        lists = [self.jamo_postings[g] for g in _grams(q, 3) if g in self.jamo_postings]
+        if not lists:
+            return np.empty(0, dtype=np.int32)
+        counts = np.bincount(np.concatenate(lists), minlength=len(self.titles))
+        k = min(self.max_candidates, int(np.count_nonzero(counts)))
+        cand = np.argpartition(-counts, k - 1)[:k]
+        max_dist = max(1, len(q) // 3)
+        scored = []
+        for p in cand:
+            dist = substring_distance(q, self.jamo[p])
+            if dist <= max_dist:
+                scored.append((dist, -int(counts[p]), abs(int(self.lengths[p]) - len(query)), int(p)))
+        scored.sort()
+        return np.array([p for *_, p in scored[:limit]], dtype=np.int32)
+
+    def search(self, query: str, limit: int = 50) -> np.ndarray:
+        """순위순 곡 위치 배열 (초성만 입력하면 초성 검색, 아니면 오타 허용 검색)"""
+        query = normalize_title(query)
+        if not query:
+            return np.empty(0, dtype=np.int32)
+        if is_choseong_query(query):
+            return self._choseong_search(query, limit)
+        return self._typo_search(query, limit)
+
+
+# ── 검색 결과 캐시 ───────────────────────────────────────────
+def normalize_query(conditions: dict, keyword: str = "", fuzzy: bool = False) -> tuple:
+    """검색 조건 → 캐시 키 (순서/공백 차이를 없앤 튜플)"""
+    keyword = " ".join(keyword.split())
+    return (tuple(sorted((k, v) for k, v in conditions.items() if v is not None)),
+            keyword, bool(fuzzy and keyword))
+
+
+class ResultCache:
+    """프로세스 전체에서 공유하는 크기 제한 LRU 캐시 (스레드 안전)
+
+    값은 읽기 전용으로 바꿔 저장하므로 여러 세션이 같은 배열을 그대로 씀
+    """
+
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key, compute) -> np.ndarray:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        value = np.asarray(compute())
+        value.setflags(write=False)
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.capacity:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        """데이터가 바뀌면(새 파티션) 저장된 결과를 모두 버림"""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "capacity": self.capacity,
+                "size": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
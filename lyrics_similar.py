@@ -0,0 +1,170 @@
+"""가사 유사도(비슷한 노래) 색인
+
+곡마다 가사 토큰의 TF-IDF 벡터를 희소 행렬(CSR)로 만들어 디스크에 저장해 두고,
+선택한 곡(들)과의 코사인 유사도 상위 k곡을 행렬 곱 한 번으로 구합니다.
+새 파티션의 곡은 저장된 어휘/IDF로 벡터만 만들어 행렬 아래에 붙입니다
+(새 단어까지 반영하려면 build로 전체를 다시 만듦).
+색인된 곡이 없거나 어휘가 비었거나 새 곡이 기존 곡보다 많으면 붙이지 않고 전체를 다시 만듭니다.
+곡이 하나도 없을 때 만든 빈 색인은 저장하지 않습니다.
+
+생성:  python lyrics_similar.py build [파티션폴더] [저장경로]
+"""
+import os
+import re
+import sys
+
+import numpy as np
+import scipy.sparse as sp
+
+import lyrics_data
+
+TFIDF_PATH = "data/lyrics_tfidf.npz"
+TOKEN_RE = re.compile(r"[가-힣a-z0-9']+")
+
+
+def tokenize(text: str) -> list:
+    return TOKEN_RE.findall(text.lower())
+
+
+def count_matrix(texts: list, vocab: dict, grow: bool = True) -> sp.csr_matrix:
+    """곡별 텍스트 → 단어 빈도 CSR 행렬 (grow=False면 vocab에 없는 단어는 버림)"""
+    indices, indptr = [], [0]
+    for text in texts:
+        for token in tokenize(text):
+            idx = vocab.setdefault(token, len(vocab)) if grow else vocab.get(token)
+            if idx is not None:
+                indices.append(idx)
+        indptr.append(len(indices))
+    counts = sp.csr_matrix(
+        (np.ones(len(indices), dtype=np.float32), np.array(indices, dtype=np.int32),
+         np.array(indptr, dtype=np.int64)),
+        shape=(len(texts), len(vocab)))
+    counts.sum_duplicates()
+    return counts
+
+
+def weight(counts: sp.csr_matrix, idf: np.ndarray) -> sp.csr_matrix:
+    """sublinear tf × idf 후 행마다 L2 정규화"""
+    counts = counts.copy()
+    counts.data = (1 + np.log(counts.data)) * idf[counts.indices]
+    norms = np.sqrt(np.asarray(counts.multiply(counts).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sp.diags(1 / norms).dot(counts).tocsr().astype(np.float32)
+
+
+def build_matrix(texts: list) -> tuple:
+    """곡별 텍스트 → (L2 정규화된 TF-IDF CSR 행렬, 어휘 dict, idf)"""
+    vocab = {}
+    counts = count_matrix(texts, vocab)
+    df = np.bincount(counts.indices, minlength=len(vocab))
+    idf = np.log((1 + len(texts)) / (1 + df)).astype(np.float32) + 1   # smooth idf
+    return weight(counts, idf), vocab, idf
+
+
+class SimilarityIndex:
+    """곡 위치 순서의 TF-IDF 행렬과 코사인 상위 k 질의"""
+
+    def __init__(self, matrix: sp.csr_matrix, song_ids: np.ndarray, vocab: dict, idf: np.ndarray):
+        self.matrix = matrix
+        self.song_ids = song_ids
+        self.vocab = vocab
+        self.idf = idf
+
+    @classmethod
+    def build(cls, songs) -> "SimilarityIndex":
+        matrix, vocab, idf = build_matrix(songs.texts())
+        return cls(matrix, songs.song_ids, vocab, idf)
+
+    def append(self, texts: list, song_ids: np.ndarray):
+        """새 곡을 저장된 어휘/IDF로 벡터화해서 뒤에 붙임 (비용은 새 곡 수에 비례)"""
+        counts = count_matrix(texts, self.vocab, grow=False)
+        self.matrix = sp.vstack([self.matrix, weight(counts, self.idf)], format="csr")
+        self.song_ids = np.concatenate([self.song_ids, song_ids])
+
+    def can_append(self, n_songs: int) -> bool:
+        """곡 n_songs개로 늘어날 때 저장된 어휘/IDF에 붙여도 되는지 (새 곡이 더 많으면 다시 만듦)"""
+        n = len(self.song_ids)
+        return n > 0 and bool(self.vocab) and n_songs - n <= n
+
+    def sync(self, songs, path: str = TFIDF_PATH) -> "SimilarityIndex":
+        """songs(lyrics_data.SongTable) 뒤에 새로 붙은 곡을 반영한 색인을 저장하고 돌려줌"""
+        n = len(self.song_ids)
+        if n == len(songs):
+            return self
+        if not self.can_append(len(songs)):
+            return self.build_and_save(songs, path)
+        self.append(songs.texts(n), songs.song_ids[n:])
+        self.save(path)
+        return self
+
+    def save(self, path: str = TFIDF_PATH):
+        tmp_path = path + ".tmp.npz"
+        m = self.matrix
+        np.savez(tmp_path, data=m.data, indices=m.indices, indptr=m.indptr,
+                 shape=np.array(m.shape), song_ids=self.song_ids,
+                 vocab=np.array(sorted(self.vocab, key=self.vocab.get)), idf=self.idf)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = TFIDF_PATH) -> "SimilarityIndex":
+        with np.load(path) as f:
+            matrix = sp.csr_matrix((f["data"], f["indices"], f["indptr"]), shape=tuple(f["shape"]))
+            vocab = {word: i for i, word in enumerate(f["vocab"].tolist())}
+            return cls(matrix, f["song_ids"], vocab, f["idf"])
+
+    @classmethod
+    def build_and_save(cls, songs, path: str = TFIDF_PATH) -> "SimilarityIndex":
+        """전체를 새로 만들어 저장 (곡이 없으면 저장하지 않음)"""
+        index = cls.build(songs)
+        if len(songs):
+            index.save(path)
+        return index
+
+    @classmethod
+    def load_or_build(cls, songs, path: str = TFIDF_PATH) -> "SimilarityIndex":
+        """저장된 행렬이 지금 곡 목록과 같으면 읽고, 앞부분만 같으면 나머지를 반영하고(sync),
+        아니면 새로 만들어 저장"""
+        if os.path.exists(path):
+            try:
+                index = cls.load(path)
+            except (KeyError, ValueError):
+                index = None   # 예전 형식
+            if index is not None:
+                n = len(index.song_ids)
+                if np.array_equal(index.song_ids, songs.song_ids[:n]):
+                    return index.sync(songs, path)
+        return cls.build_and_save(songs, path)
+
+    def top_k_batch(self, positions, k: int = 5) -> tuple:
+        """여러 곡의 상위 k 유사곡을 한 번에 → (곡 위치 [b, k], 유사도 [b, k])"""
+        positions = np.atleast_1d(np.asarray(positions))
+        scores = (self.matrix @ self.matrix[positions].T).T.toarray()
+        scores[np.arange(len(positions)), positions] = -1   # 자기 자신 제외
+        k = min(k, scores.shape[1] - 1)
+        if k <= 0:
+            empty = np.empty((len(positions), 0))
+            return empty.astype(np.int64), empty
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+    def top_k(self, position: int, k: int = 5) -> tuple:
+        top, scores = self.top_k_batch([position], k)
+        return top[0], scores[0]
+
+
+# ── CLI ──────────────────────────────────────────────────────
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "build":
+        print(__doc__)
+        sys.exit(1)
+    src = sys.argv[2] if len(sys.argv) > 2 else lyrics_data.PARTITION_DIR
+    dst = sys.argv[3] if len(sys.argv) > 3 else TFIDF_PATH
+    songs = lyrics_data.SongTable()
+    for path in lyrics_data.list_partitions(src):
+        songs.append(lyrics_data.load_frame(path))
+    index = SimilarityIndex.build(songs)
+    index.save(dst)
+    print(f"{dst}: {index.matrix.shape[0]}곡 × {index.matrix.shape[1]}단어, "
+          f"0이 아닌 값 {index.matrix.nnz}개")
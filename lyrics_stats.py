@@ -0,0 +1,204 @@
+"""가사 말뭉치 통계
+
+파티션을 ingest할 때 가사 열을 한 번만 훑어서 작은 집계 테이블을 만들어
+파티션 옆(data/lyrics/stats/)에 저장해 둡니다. 통계 탭은 이 집계 테이블만 읽어서 그리므로
+화면을 열 때마다 가사 열을 다시 훑지 않습니다.
+
+    data/lyrics/stats/year=2019.words.arrow         연도별 단어 빈도 (year, word, count, songs)
+    data/lyrics/stats/year=2019.lengths.arrow       연도별 곡 수/줄 수/단어 수
+    data/lyrics/stats/year=2019.artist_words.arrow  가수별 단어 빈도 (그 연도에 처음 나온 곡만)
+    data/lyrics/stats/year=2019.artists.arrow       가수별 곡 수/줄 수/단어 수 (〃)
+
+여러 연도에 걸쳐 나온 곡은 연도별 통계에는 연도마다, 가수별 통계에는 처음 나온 연도에 한 번만 셉니다.
+
+생성:  python lyrics_stats.py build [파티션폴더]
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+import lyrics_data
+
+STATS_DIRNAME = "stats"
+STAT_KINDS = ("words", "lengths", "artist_words", "artists")
+# lyrics_similar.TOKEN_RE와 같은 토큰 (그 밖의 문자로 나눔)
+NON_TOKEN_RE = r"[^가-힣a-z0-9']+"
+PER_TOKENS = 10000          # 단어 빈도 단위 (만 단어당)
+DISTINCTIVE_TOP_N = 30      # 가수마다 미리 골라 두는 특징 단어 수
+DISTINCTIVE_MIN_COUNT = 2   # 한 번만 쓴 단어는 특징 단어에서 제외
+
+
+# ── 집계 (ingest 시 한 번) ───────────────────────────────────
+def stats_dir(data_dir: str = lyrics_data.PARTITION_DIR) -> str:
+    return os.path.join(data_dir, STATS_DIRNAME)
+
+
+def stats_path(partition: str, kind: str) -> str:
+    data_dir, name = os.path.split(partition)
+    return os.path.join(stats_dir(data_dir), name.replace(".arrow", f".{kind}.arrow"))
+
+
+def is_fresh(partition: str) -> bool:
+    """집계 파일이 모두 있고 파티션보다 나중에 만들어졌는지"""
+    mtime = os.path.getmtime(partition)
+    return all(os.path.exists(p) and os.path.getmtime(p) >= mtime
+               for p in (stats_path(partition, kind) for kind in STAT_KINDS))
+
+
+def tokenize_rows(lyrics: pa.Array) -> tuple:
+    """list<string> 가사 배열 → (토큰, 토큰의 행 번호, 행별 줄 수) — 파이썬 루프 없이 Arrow 연산으로"""
+    lines = pc.list_flatten(lyrics)
+    line_row = pc.list_parent_indices(lyrics)
+    tokens = pc.split_pattern_regex(pc.utf8_lower(lines), NON_TOKEN_RE)
+    words = pc.list_flatten(tokens)
+    word_row = pc.take(line_row, pc.list_parent_indices(tokens))
+    keep = pc.not_equal(words, "")
+    n_lines = pc.fill_null(pc.list_value_length(lyrics), 0)
+    return pc.filter(words, keep), pc.filter(word_row, keep), n_lines
+
+
+def aggregate_partition(df: pd.DataFrame, seen_ids: np.ndarray) -> dict:
+    """파티션 하나 → 집계 테이블 dict (seen_ids: 앞 연도 파티션에 이미 나온 song_id)"""
+    df = df.drop_duplicates("song_id")
+    year = int(df["year"].iloc[0]) if len(df) else 0
+    words, word_row, n_lines = tokenize_rows(lyrics_data.list_array(df["lyrics"]))
+    n_lines = n_lines.to_numpy(zero_copy_only=False)
+    n_tokens = np.bincount(word_row.to_numpy(zero_copy_only=False), minlength=len(df))
+    rows = pa.table({"row": word_row, "word": words})
+
+    word_counts = rows.group_by("word").aggregate([("row", "count"), ("row", "count_distinct")])
+    tables = {
+        "words": pa.table({
+            "year": pa.array(np.full(word_counts.num_rows, year, dtype=np.int16)),
+            "word": word_counts["word"],
+            "count": word_counts["row_count"].cast(pa.int64()),
+            "songs": word_counts["row_count_distinct"].cast(pa.int64()),
+        }),
+        "lengths": pa.table({
+            "year": pa.array([year], type=pa.int16()),
+            "songs": pa.array([len(df)], type=pa.int64()),
+            "lines": pa.array([int(n_lines.sum())], type=pa.int64()),
+            "tokens": pa.array([int(n_tokens.sum())], type=pa.int64()),
+        }),
+    }
+
+    # 가수별 통계는 이 연도에 처음 나온 곡만
+    new = ~np.isin(df["song_id"].to_numpy(), seen_ids)
+    artist = df["artist"].astype(str).to_numpy()
+    row_artist = pa.array(artist[rows["row"].to_numpy()])
+    artist_counts = (pa.table({"artist": row_artist, "word": words})
+                     .filter(pa.array(new[rows["row"].to_numpy()]))
+                     .group_by(["artist", "word"]).aggregate([("word", "count")]))
+    # 가수/단어 문자열은 행마다 반복되므로 사전 인코딩해서 저장 (파일 크기와 로딩 시간 절약)
+    tables["artist_words"] = pa.table({
+        "artist": pc.dictionary_encode(artist_counts["artist"]),
+        "word": pc.dictionary_encode(artist_counts["word"]),
+        "count": artist_counts["word_count"].cast(pa.int32()),
+    })
+    per_artist = pd.DataFrame({"artist": artist[new], "lines": n_lines[new], "tokens": n_tokens[new]})
+    per_artist = per_artist.groupby("artist").agg(
+        songs=("lines", "size"), lines=("lines", "sum"), tokens=("tokens", "sum")).reset_index()
+    tables["artists"] = pa.Table.from_pandas(per_artist.astype(
+        {"songs": "int64", "lines": "int64", "tokens": "int64"}), preserve_index=False)
+    return tables
+
+
+def ensure_stats(data_dir: str = lyrics_data.PARTITION_DIR) -> list:
+    """집계가 없거나 오래된 파티션만 집계해서 저장하고 그 파티션 경로 목록을 돌려줌
+
+    가수별 통계는 앞 연도에 나온 곡을 빼고 세므로, 어떤 파티션을 다시 집계하면
+    그 뒤 연도 파티션도 함께 다시 집계합니다.
+    """
+    partitions = lyrics_data.list_partitions(data_dir)
+    os.makedirs(stats_dir(data_dir), exist_ok=True)
+    seen = [np.empty(0, dtype=np.int64)]
+    stale, built = False, []
+    for path in partitions:
+        stale = stale or not is_fresh(path)
+        if stale:
+            df = lyrics_data.load_frame(path)
+            tables = aggregate_partition(df, np.concatenate(seen))
+            for kind, stat in tables.items():
+                lyrics_data.write_table(stat.replace_schema_metadata(None), stats_path(path, kind))
+            built.append(path)
+        seen.append(lyrics_data.open_table(path).column("song_id").to_numpy())
+    return built
+
+
+def load_tables(data_dir: str = lyrics_data.PARTITION_DIR) -> dict:
+    """저장된 집계 테이블을 종류별로 이어 붙인 DataFrame dict"""
+    partitions = [p for p in lyrics_data.list_partitions(data_dir) if is_fresh(p)]
+    tables = {}
+    for kind in STAT_KINDS:
+        parts = [lyrics_data.open_table(stats_path(p, kind)) for p in partitions]
+        tables[kind] = pa.concat_tables(parts).to_pandas() if parts else None
+    return tables
+
+
+# ── 통계 탭용 테이블 ─────────────────────────────────────────
+class CorpusStats:
+    """집계 테이블을 합쳐 통계 탭에서 바로 쓰는 형태로 만들어 둔 것 (가사 열은 쓰지 않음)"""
+
+    def __init__(self, tables: dict):
+        words = tables.get("words")
+        self.empty = words is None or words.empty
+        if self.empty:
+            return
+        lengths = tables["lengths"].groupby("year").sum()
+        # 연도별 평균 곡 길이
+        self.lengths = lengths.assign(
+            avg_lines=lengths["lines"] / lengths["songs"].clip(lower=1),
+            avg_tokens=lengths["tokens"] / lengths["songs"].clip(lower=1))
+        self.years = self.lengths.index.tolist()
+
+        # 연도 × 단어 빈도 (만 단어당) — 트렌드 차트는 여기서 열만 골라 씀
+        counts = words.pivot_table(index="word", columns="year", values="count",
+                                   aggfunc="sum", fill_value=0)
+        self.word_rate = counts.div(self.lengths["tokens"].reindex(counts.columns).clip(lower=1)) * PER_TOKENS
+        self.top_words = counts.sum(axis=1).sort_values(ascending=False)
+
+        # 가수별 어휘 수 (여러 연도의 곡을 합쳐 서로 다른 단어 수)
+        artist_words = tables["artist_words"].groupby(["artist", "word"], as_index=False, observed=True)["count"].sum()
+        artists = tables["artists"].groupby("artist").sum()
+        artists["vocab"] = artist_words.groupby("artist", observed=True).size().reindex(artists.index, fill_value=0)
+        artists["avg_tokens"] = artists["tokens"] / artists["songs"].clip(lower=1)
+        self.artists = artists.sort_values("vocab", ascending=False)
+
+        # 가수별 특징 단어: 가수 한 명을 문서 하나로 본 TF-IDF 상위 단어
+        n_artists = len(artists)
+        artist_df = artist_words.groupby("word", observed=True).size()
+        tf = artist_words["count"] / artists["tokens"].reindex(artist_words["artist"]).to_numpy()
+        idf = np.log(n_artists / artist_df.reindex(artist_words["word"]).to_numpy())
+        scored = artist_words.assign(score=tf * idf)
+        scored = scored[scored["count"] >= DISTINCTIVE_MIN_COUNT]
+        self.distinctive = (scored.sort_values(["artist", "score"], ascending=[True, False])
+                            .groupby("artist", observed=True).head(DISTINCTIVE_TOP_N).set_index("artist"))
+
+    @classmethod
+    def load(cls, data_dir: str = lyrics_data.PARTITION_DIR) -> "CorpusStats":
+        return cls(load_tables(data_dir))
+
+    def word_trend(self, words: list) -> pd.DataFrame:
+        """단어 목록 → 연도 × 단어 빈도 (만 단어당)"""
+        words = [w for w in words if w in self.word_rate.index]
+        return self.word_rate.loc[words].T
+
+    def distinctive_words(self, artist: str) -> pd.DataFrame:
+        if artist not in self.distinctive.index:
+            return pd.DataFrame(columns=["word", "count", "score"])
+        return self.distinctive.loc[[artist], ["word", "count", "score"]].reset_index(drop=True)
+
+
+# ── CLI ──────────────────────────────────────────────────────
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "build":
+        print(__doc__)
+        sys.exit(1)
+    src = sys.argv[2] if len(sys.argv) > 2 else lyrics_data.PARTITION_DIR
+    for path in ensure_stats(src):
+        print(f"{path} → {stats_dir(src)}")
+    print("집계 완료")
@@ -0,0 +1,105 @@
+"""가사 검색 저장소
+
+연도별 파티션(lyrics_data)과 그 위에 만든 색인들(lyrics_search, lyrics_similar),
+파티션마다 미리 집계해 둔 통계(lyrics_stats)를 한데 묶습니다.
+앱은 프로세스마다 이 객체 하나를 만들어 모든 세션이 함께 쓰고,
+refresh()로 새로 생긴 파티션만 읽어서 색인에 추가합니다.
+"""
+import threading
+
+import numpy as np
+
+import lyrics_data
+import lyrics_search
+import lyrics_similar
+import lyrics_stats
+
+
+class LyricsStore:
+    """파티션 + 곡 테이블 + 필터/키워드/유사 검색 색인 + 결과 캐시 + 말뭉치 통계"""
+
+    def __init__(self, data_dir: str = lyrics_data.PARTITION_DIR,
+                 csv_path: str = lyrics_data.CSV_PATH,
+                 tfidf_path: str = lyrics_similar.TFIDF_PATH,
+                 cache_size: int = 256):
+        self.data_dir = data_dir
+        self.tfidf_path = tfidf_path
+        self.partitions = []
+        self.frames = []   # 메모리 맵 파티션 (버퍼를 살려 두기 위해 보관)
+        self.songs = lyrics_data.SongTable()
+        self.filters = lyrics_search.FilterIndex()
+        self.keywords = lyrics_search.KeywordIndex(self.songs)
+        self.fuzzy = lyrics_search.FuzzyIndex()
+        self.cache = lyrics_search.ResultCache(cache_size)
+        self.similarity = None
+        self.stats = None
+        self.generation = 0   # 파티션이 추가될 때마다 증가 (캐시 키에 포함)
+        self._lock = threading.Lock()
+
+        lyrics_data.ensure_partitions(csv_path, data_dir)
+        self.refresh()
+        self.similarity = lyrics_similar.SimilarityIndex.load_or_build(self.songs, tfidf_path)
+
+    # ── 파티션 ───────────────────────────────────────────────
+    def refresh(self) -> list:
+        """새 파티션이 생겼으면 색인에 추가하고 그 경로 목록을 돌려줌 (기존 파티션은 다시 읽지 않음)"""
+        if not self._new_partitions():
+            return []
+        with self._lock:
+            new = self._new_partitions()
+            for path in new:
+                self._append(path)
+            if new:
+                if self.similarity is not None:
+                    # 처음 받은 파티션이거나 새 곡이 많으면 어휘/IDF까지 다시 만듦
+                    self.similarity = self.similarity.sync(self.songs, self.tfidf_path)
+                self.generation += 1
+                self.cache.clear()
+                # ingest 때 만들어 둔 집계를 읽음 (없으면 새 파티션만 집계)
+                lyrics_stats.ensure_stats(self.data_dir)
+                self.stats = lyrics_stats.CorpusStats.load(self.data_dir)
+        return new
+
+    def _new_partitions(self) -> list:
+        loaded = set(self.partitions)
+        return [p for p in lyrics_data.list_partitions(self.data_dir) if p not in loaded]
+
+    def _append(self, path: str):
+        df = lyrics_data.load_frame(path)
+        start = len(self.songs)
+        row_song = self.songs.append(df)
+        self.filters.append(df, row_song, len(self.songs))
+        self.keywords.add(self.songs.texts(start))
+        self.fuzzy.add(self.songs.titles(start))
+        self.frames.append(df)
+        self.partitions.append(path)
+
+    # ── 선택지 ───────────────────────────────────────────────
+    def years(self) -> list:
+        return self.filters.values("year") if self.filters.has_field("year") else []
+
+    def artists(self) -> list:
+        return self.filters.values("artist") if self.filters.has_field("artist") else []
+
+    def lyricists(self) -> list:
+        return self.filters.values("lyricist") if self.filters.has_field("lyricist") else []
+
+    def arrangers(self) -> list:
+        return self.filters.values("arranger") if self.filters.has_field("arranger") else []
+
+    # ── 검색 ─────────────────────────────────────────────────
+    def _search(self, query: tuple) -> np.ndarray:
+        """정규화된 검색 조건 → 곡 위치 배열 (조건마다 곡 위치 목록을 구해 교집합)"""
+        conditions, keyword, fuzzy = query
+        conditions = dict(conditions)
+        if fuzzy:
+            # 유사 검색은 순위 순서를 유지한 채 필터 조건에 맞는 곡만 남김
+            ranked = self.fuzzy.search(keyword)
+            return ranked[np.isin(ranked, self.filters.select(conditions))]
+        keyword_positions = [self.keywords.search_positions(keyword)] if keyword else []
+        return self.filters.select(conditions, *keyword_positions)
+
+    def search(self, query: tuple) -> np.ndarray:
+        """lyrics_search.normalize_query()로 만든 조건 → 곡 위치 배열 (LRU 캐시 사용)"""
+        key = (self.generation, query)
+        return self.cache.get_or_compute(key, lambda: self._search(query))
@@ -1,10 +1,15 @@
 import streamlit as st
-import feedparser
-import re
-from datetime import datetime
+import os
+import time
+from datetime import datetime, timedelta, timezone
 from collections import Counter
 from urllib.parse import quote
 
+import news_cards
+import news_feeds
+import news_store
+import news_text
+
 # ── 페이지 설정 ──────────────────────────────────────────────
 st.set_page_config(
     page_title="📰 뉴스 트렌드 대시보드",
@@ -107,6 +112,20 @@ RSS_SOURCES = {
     "BBC World":          "http://feeds.bbci.co.uk/news/world/rss.xml",
 }
 
+PERIODS = {"최근 1일": 1, "최근 3일": 3, "최근 7일": 7}
+MAX_ARTICLES = 2000   # 한 화면에서 다루는 최대 기사 수
+TREND_WINDOWS = {"최근 1시간": 1, "최근 3시간": 3, "최근 6시간": 6}
+TREND_BASELINE_HOURS = 72   # 급상승 비교 기준 구간 (최근 구간 바로 앞 3일)
+KST = timezone(timedelta(hours=9))   # 기사 시각 표시 기준
+HEALTH_ICONS = {"ok": "✅", "slow": "🐢", "error": "❌"}
+
+# 백그라운드 새로고침 간격(초) — 속보 피드는 더 자주, 나머지는 news_feeds.REFRESH_INTERVAL(5분)
+REFRESH_INTERVALS = {
+    "연합뉴스 (속보)": 120,
+    "YTN 뉴스":        180,
+    "Hacker News (IT)": 180,
+}
+
 SOURCE_COLORS = [
     "#ef4444","#f97316","#eab308","#22c55e",
     "#14b8a6","#3b82f6","#8b5cf6","#ec4899","#64748b","#0ea5e9",
@@ -125,26 +144,58 @@ STOPWORDS = set([
 
 
 # ── 함수 ─────────────────────────────────────────────────────
-@st.cache_data(ttl=300)  # 5분 캐시
-def fetch_rss(url: str, source_name: str) -> list:
-    try:
-        feed = feedparser.parse(url)
-        articles = []
-        for entry in feed.entries[:20]:
-            title   = entry.get("title", "")
-            link    = entry.get("link", "#")
-            summary = re.sub(r'<[^>]+>', '', entry.get("summary", ""))[:200]
-            published = entry.get("published", entry.get("updated", ""))
-            articles.append({
-                "title":     title,
-                "link":      link,
-                "summary":   summary,
-                "published": published,
-                "source":    source_name,
-            })
-        return articles
-    except Exception as e:
-        return []
+@st.cache_resource
+def get_feed_cache():
+    # 디스크 피드 캐시 (서버를 재시작해도 유지, 5분이 지나면 조건부 요청으로 바뀐 피드만 다시 파싱)
+    return news_feeds.FeedCache()
+
+
+@st.cache_resource
+def get_article_store():
+    # 모든 세션이 함께 쓰는 SQLite 기사 저장소 (새로고침을 거듭해도 지난 기사 유지)
+    os.makedirs(os.path.dirname(news_store.DB_PATH), exist_ok=True)
+    return news_store.ArticleStore()
+
+
+@st.cache_resource
+def get_refresher():
+    # 프로세스에 하나: 모든 피드를 각자 간격으로 받아 저장소에 넣음 (세션은 저장소만 읽음)
+    return news_feeds.FeedRefresher(RSS_SOURCES, get_article_store(), get_feed_cache(),
+                                    intervals=REFRESH_INTERVALS).start()
+
+
+@st.cache_resource(max_entries=32)
+def get_keyword_matcher(keywords: tuple):
+    # 키워드 조합마다 한 번만 컴파일 (기사별 매치 결과도 매처 안에 캐시됨)
+    return news_text.KeywordMatcher(keywords)
+
+
+@st.cache_resource
+def get_trend_tracker():
+    # 시간 버킷별 단어 수 (프로세스 전체 공유, 보관 기간 3주)
+    # 버킷은 발행 시각으로 — 처음 받은 피드의 지난 기사 20개가 모두 이번 시간에 몰려 급상승으로 보이지 않게
+    # 조회 커서는 마지막으로 받은 시각 — 새로고침에서 제목/요약이 고쳐진 기사도 다시 받아 새로 셈
+    return news_text.TrendTracker(get_token_cache(), time_key="published_ts", cursor_key="last_seen")
+
+
+def sync_trends(store) -> news_text.TrendTracker:
+    # 마지막으로 반영한 뒤에 저장소에 들어오거나 갱신된 기사만 추가 (내용이 같은 기사는 한 번만 셈)
+    tracker = get_trend_tracker()
+    retention_start = time.time() - tracker.retention * tracker.bucket_seconds
+    tracker.add(store.query(since=max(tracker.synced_until, retention_start), by="last_seen"))
+    return tracker
+
+
+@st.cache_resource
+def get_story_clusterer():
+    # 기사별 MinHash 서명을 id로 캐시해 두고 모든 세션이 공유
+    return news_text.StoryClusterer()
+
+
+def group_stories(articles: list) -> list:
+    # 여러 언론사에 실린 같은 기사를 묶음 → [[대표 기사, 다른 사본...], ...] (대표는 가장 최근 기사)
+    groups = get_story_clusterer().cluster(articles)
+    return [[articles[i] for i in group] for group in groups]
 
 
 def filter_by_keyword(articles: list, keyword: str) -> list:
@@ -155,10 +206,17 @@ def filter_by_keyword(articles: list, keyword: str) -> list:
             if kw in a["title"].lower() or kw in a["summary"].lower()]
 
 
-def extract_words(articles: list) -> Counter:
-    text = " ".join([a["title"] + " " + a["summary"] for a in articles])
-    words = re.findall(r'[가-힣a-zA-Z]{2,10}', text)
-    return Counter(w for w in words if w.lower() not in STOPWORDS)
+@st.cache_resource
+def get_token_cache():
+    # 기사 id → 단어 빈도 (기사마다 한 번만 세고 모든 세션이 공유, 제목/요약이 바뀌면 다시 셈)
+    return news_text.TokenCache(STOPWORDS)
+
+
+def extract_words(articles: list) -> news_text.WordFrequency:
+    # 세션마다 지금 보고 있는 기사 집합의 빈도를 유지하고, 새로 들어오거나 빠진 기사만 반영
+    if "word_freq" not in st.session_state:
+        st.session_state.word_freq = news_text.WordFrequency(get_token_cache())
+    return st.session_state.word_freq.update(articles)
 
 
 def get_source_color(source: str) -> str:
@@ -166,15 +224,17 @@ def get_source_color(source: str) -> str:
     return SOURCE_COLORS[idx % len(SOURCE_COLORS)]
 
 
-def format_time(pub_str: str) -> str:
-    if not pub_str:
-        return ""
-    try:
-        import email.utils
-        t = email.utils.parsedate_to_datetime(pub_str)
-        return t.strftime("%m/%d %H:%M")
-    except:
-        return pub_str[:16] if pub_str else ""
+def format_time(article: dict) -> str:
+    # 저장할 때 정규화한 발행 시각(epoch 초)을 표시만 함 (날짜를 읽지 못한 기사는 원래 문자열)
+    if not article["date_ok"]:
+        return article["published"][:16]
+    return datetime.fromtimestamp(article["published_ts"], KST).strftime("%m/%d %H:%M")
+
+
+@st.cache_resource
+def get_card_renderer():
+    # 기사 카드 HTML 조각을 기사 id로 캐시 (모든 세션 공유)
+    return news_cards.CardRenderer(get_source_color, format_time)
 
 
 # ── 세션 초기화 ───────────────────────────────────────────────
@@ -182,8 +242,6 @@ if "keywords" not in st.session_state:
     st.session_state.keywords = ["AI", "경제", "날씨"]
 if "selected_sources" not in st.session_state:
     st.session_state.selected_sources = list(RSS_SOURCES.keys())[:4]
-if "all_articles" not in st.session_state:
-    st.session_state.all_articles = []
 
 
 # ── UI ──────────────────────────────────────────────────────
@@ -203,6 +261,10 @@ with st.sidebar:
     )
     st.session_state.selected_sources = selected
 
+    st.markdown("### 🗓️ 기간")
+    period = st.selectbox("기간", list(PERIODS.keys()), label_visibility="collapsed")
+    dedup = st.toggle("같은 기사 묶기", value=True, help="여러 언론사에 실린 거의 같은 기사를 카드 하나로 보여 줍니다.")
+
     st.markdown("### 🔍 관심 키워드")
     new_kw = st.text_input("키워드 추가", placeholder="예: 반도체, ChatGPT")
     if st.button("➕ 추가") and new_kw:
@@ -221,37 +283,69 @@ with st.sidebar:
 
     st.markdown("---")
     fetch_btn = st.button("🔄 뉴스 새로고침", use_container_width=True, type="primary")
-    st.caption(f"마지막 업데이트: {datetime.now().strftime('%H:%M:%S')}")
+    refresher = get_refresher()
+    last_refresh = refresher.last_refresh(st.session_state.selected_sources)
+    st.caption(f"마지막 업데이트: {datetime.fromtimestamp(last_refresh, KST).strftime('%H:%M:%S')}"
+               if last_refresh else "마지막 업데이트: 받는 중...")
+
+    # 언론사별 마지막 새로고침 기록 (실패한 피드, 느린 피드가 위로)
+    with st.expander("🩺 피드 상태 (Feed health)"):
+        health = refresher.health.summary(st.session_state.selected_sources)
+        if health:
+            st.dataframe([{
+                "상태": HEALTH_ICONS[row["health"]],
+                "언론사": row["source"],
+                "전체(ms)": round(row["last_ms"]),
+                "p95(ms)": round(row["p95_ms"]),
+                "DNS(ms)": row["dns_ms"] and round(row["dns_ms"]),
+                "연결(ms)": row["connect_ms"] and round(row["connect_ms"]),
+                "대기(ms)": row["wait_ms"] and round(row["wait_ms"]),
+                "받기(ms)": row["download_ms"] and round(row["download_ms"]),
+                "파싱(ms)": row["parse_ms"] and round(row["parse_ms"]),
+                "KB": row["bytes"] and round(row["bytes"] / 1024, 1),
+                "기사": row["entries"],
+                "HTTP": row["status"],
+                "캐시": row["outcome"],
+                "연속 실패": row["failures"],
+                "오류": row["error"],
+            } for row in health], hide_index=True)
+        else:
+            st.caption("아직 기록이 없습니다.")
+        st.download_button("JSON 내보내기", refresher.health.export_json(), file_name="feed_health.json",
+                           mime="application/json", use_container_width=True)
 
 
 # ─── 뉴스 불러오기 ───
-if fetch_btn or not st.session_state.all_articles:
-    if not st.session_state.selected_sources:
-        st.warning("언론사를 1개 이상 선택해주세요.")
-        st.stop()
+store = get_article_store()
+since = time.time() - PERIODS[period] * 86400
+if not st.session_state.selected_sources:
+    st.warning("언론사를 1개 이상 선택해주세요.")
+    st.stop()
 
+# 피드는 백그라운드 새로고침이 받으므로 세션은 기다리지 않음
+# (새로고침 버튼을 눌렀거나, 서버를 막 띄워 아직 한 번도 받지 못한 피드가 있을 때만 잠깐 기다림)
+if fetch_btn:
     with st.spinner("뉴스를 불러오는 중..."):
-        all_articles = []
-        progress = st.progress(0)
-        for i, src in enumerate(st.session_state.selected_sources):
-            url = RSS_SOURCES[src]
-            articles = fetch_rss(url, src)
-            all_articles.extend(articles)
-            progress.progress((i + 1) / len(st.session_state.selected_sources))
-        st.session_state.all_articles = all_articles
-        progress.empty()
-
-articles = st.session_state.all_articles
+        refresher.refresh_now(st.session_state.selected_sources, wait=news_feeds.FETCH_TIMEOUT + 1)
+elif store.count(st.session_state.selected_sources, since) == 0:
+    with st.spinner("뉴스를 불러오는 중..."):
+        refresher.wait_ready(st.session_state.selected_sources, timeout=news_feeds.FETCH_TIMEOUT + 1)
+
+# 세션에는 기사를 쌓아 두지 않고 매번 필요한 만큼만 조회 (발행 시각 색인으로 기간 조회 + 최신순)
+articles = store.query(st.session_state.selected_sources, since, limit=MAX_ARTICLES)
 
 if not articles:
     st.warning("뉴스를 불러올 수 없습니다. 언론사를 선택하고 새로고침해 주세요.")
     st.stop()
 
+# 같은 기사의 사본은 한 이야기로 묶고, 단어 빈도도 이야기마다 한 번만 셈
+stories = group_stories(articles) if dedup else [[a] for a in articles]
+
 # ─── 통계 ───
 total = len(articles)
 sources_cnt = len(set(a["source"] for a in articles))
-word_freq = extract_words(articles)
-top_word = word_freq.most_common(1)[0][0] if word_freq else "N/A"
+word_freq = extract_words([story[0] for story in stories])
+top_word = word_freq.most_common(1)[0][0] if word_freq.total else "N/A"
 
 s1, s2, s3, s4 = st.columns(4)
 with s1:
@@ -271,52 +365,33 @@ tab1, tab2, tab3 = st.tabs(["📋 전체 뉴스", "🔍 키워드 필터", "📊
 # ── TAB 1: 전체 뉴스 ─────────────────────────────────────────
 with tab1:
     sort_opt = st.selectbox("정렬", ["최신순", "언론사별"], label_visibility="collapsed")
-    sorted_articles = articles if sort_opt == "최신순" else sorted(articles, key=lambda x: x["source"])
+    sorted_stories = stories if sort_opt == "최신순" else sorted(stories, key=lambda s: s[0]["source"])
 
     search_q = st.text_input("", placeholder="🔎 제목/내용 검색...", label_visibility="collapsed")
-    display = filter_by_keyword(sorted_articles, search_q)
-
-    st.caption(f"{len(display)}개 기사")
-
-    for art in display[:50]:  # 최대 50개
-        color = get_source_color(art["source"])
-        pub = format_time(art["published"])
-        st.markdown(f"""
-        <div class="news-card">
-            <div class="news-title">
-                <a href="{art['link']}" target="_blank">{art['title']}</a>
-            </div>
-            <div style="margin: 0.3rem 0; color:#475569; font-size:0.85rem">{art['summary'][:120]}{'...' if len(art['summary'])>120 else ''}</div>
-            <div class="news-meta">
-                <span class="source-badge" style="background:{color}22; color:{color}; border:1px solid {color}44">{art['source']}</span>
-                {pub}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+    # 사본 중 하나라도 검색어가 있으면 그 이야기를 보여 줌
+    display = [s for s in sorted_stories if filter_by_keyword(s, search_q)] if search_q else sorted_stories
+
+    st.caption(f"{sum(len(s) for s in display)}개 기사 · {len(display)}개 이야기" if dedup else f"{len(display)}개 기사")
+    date_failures = store.date_failures(st.session_state.selected_sources)
+    if date_failures:
+        st.caption(f"발행 시각을 읽지 못한 기사 {date_failures}개는 처음 받은 시각으로 정렬했습니다.")
+
+    # 카드 50개(최대)를 HTML 하나로 묶어 한 번에 보냄
+    st.markdown(get_card_renderer().story_list(display[:50]), unsafe_allow_html=True)
 
 # ── TAB 2: 키워드 필터 ───────────────────────────────────────
 with tab2:
     st.markdown("#### 키워드별 뉴스")
 
+    # 모든 키워드를 기사마다 한 번의 스캔으로 매칭
+    keyword_matches = get_keyword_matcher(tuple(st.session_state.keywords)).match(articles)
     for kw in st.session_state.keywords:
-        filtered = filter_by_keyword(articles, kw)
+        filtered = keyword_matches[kw]
         with st.expander(f"🔖 **{kw}** — {len(filtered)}개 기사", expanded=len(filtered) > 0):
             if not filtered:
                 st.info(f"'{kw}' 관련 기사가 없습니다.")
-            for art in filtered[:10]:
-                color = get_source_color(art["source"])
-                pub = format_time(art["published"])
-                st.markdown(f"""
-                <div class="news-card">
-                    <div class="news-title">
-                        <a href="{art['link']}" target="_blank">{art['title']}</a>
-                    </div>
-                    <div class="news-meta">
-                        <span class="source-badge" style="background:{color}22; color:{color}; border:1px solid {color}44">{art['source']}</span>
-                        {pub}
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+            else:
+                st.markdown(get_card_renderer().article_list(filtered[:10], summary=False), unsafe_allow_html=True)
 
     if not st.session_state.keywords:
         st.info("사이드바에서 관심 키워드를 추가하세요.")
@@ -325,7 +400,8 @@ with tab2:
 with tab3:
     st.markdown("#### 📊 자주 등장하는 단어 TOP 30")
 
-    top_words = word_freq.most_common(30)
+    freq_source = st.selectbox("언론사", ["전체"] + sorted(word_freq.by_source), key="freq_source")
+    top_words = word_freq.most_common(30, None if freq_source == "전체" else freq_source)
 
     if top_words:
         # 막대 차트 (streamlit 내장)
@@ -343,6 +419,19 @@ with tab3:
             html += f'<span class="word-cloud-item" style="font-size:{size:.2f}rem; opacity:{opacity:.2f}">{word} <small style="color:#94a3b8">({cnt})</small></span>'
         st.markdown(html, unsafe_allow_html=True)
 
+    # 최근 구간의 빈도가 앞 3일 기준보다 크게 뛴 단어 (위에서 고른 언론사 기준)
+    st.markdown("#### 🔥 급상승 단어")
+    trend_window = st.radio("최근 구간", list(TREND_WINDOWS.keys()), horizontal=True, key="trend_window")
+    trending = sync_trends(store).trending(TREND_WINDOWS[trend_window], TREND_BASELINE_HOURS,
+                                           None if freq_source == "전체" else freq_source)
+    if trending:
+        import pandas as pd
+        df_trend = pd.DataFrame(trending, columns=["단어", "최근 횟수", "기대 횟수", "점수"])
+        st.dataframe(df_trend.round(2), hide_index=True, use_container_width=True)
+    else:
+        st.info("아직 급상승 단어가 없습니다. 기사 기록이 쌓이면 표시됩니다.")
+
+    if top_words:
         # 언론사별 기사 수
         st.markdown("#### 📡 언론사별 기사 수")
         source_cnt = Counter(a["source"] for a in articles)
@@ -0,0 +1,93 @@
+"""뉴스 카드 HTML 만들기 (main_4.py)
+
+목록 하나(전체 뉴스 50개, 키워드마다 10개)를 HTML 문자열 하나로 만들어 st.markdown 한 번으로 보냅니다.
+카드마다 st.markdown을 부르면 카드 수만큼 델타 메시지가 브라우저로 가므로, rerun 비용이 목록 수에만 비례하게 합니다.
+
+제목/요약/언론사/링크는 모두 HTML 이스케이프하고, 링크는 http(s)만 남깁니다.
+제목과 요약의 줄바꿈/들여쓰기는 공백 하나로 줄입니다. 목록 전체가 markdown 하나라서
+빈 줄이 HTML 블록을 끝내고 들여쓴 다음 줄이 코드 블록이 되면 뒤의 카드가 모두 글자로 보이기 때문입니다.
+카드 조각은 (모양, 기사 id, 묶인 사본 id들)로 캐시해 두고, 제목이나 요약, 표시 시각이 바뀐 기사만 다시 만듭니다.
+"""
+import html
+import threading
+from collections import OrderedDict
+
+CARD_CACHE_SIZE = 20000     # 기억하는 카드 조각 수
+SUMMARY_PREVIEW = 120       # 카드에 보이는 요약 글자 수
+
+
+def one_line(text: str) -> str:
+    """줄바꿈/탭/연속 공백 → 공백 하나"""
+    return " ".join((text or "").split())
+
+
+def safe_link(link: str) -> str:
+    """http(s) 링크만 그대로 (javascript: 같은 링크는 "#")"""
+    link = (link or "").strip()
+    return html.escape(link, quote=True) if link.lower().startswith(("http://", "https://")) else "#"
+
+
+class CardRenderer:
+    """기사 dict → 카드 HTML 조각 (조각은 LRU 캐시, 스레드 안전)
+
+    color_of(언론사) → 색, time_of(기사) → 표시할 시각 문자열
+    """
+
+    def __init__(self, color_of, time_of, cache_size: int = CARD_CACHE_SIZE):
+        self.color_of = color_of
+        self.time_of = time_of
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def _badge(self, source: str, link: str = None) -> str:
+        color = self.color_of(source)
+        style = f"background:{color}22; color:{color}; border:1px solid {color}44"
+        if link is None:
+            return f'<span class="source-badge" style="{style}">{html.escape(source)}</span>'
+        return (f'<a class="source-badge" href="{safe_link(link)}" target="_blank" '
+                f'style="{style}; text-decoration:none">{html.escape(source)}</a>')
+
+    def _build(self, art: dict, copies: list, summary: bool, time_text: str) -> str:
+        title = html.escape(one_line(art["title"]))
+        parts = [
+            '<div class="news-card"><div class="news-title">'
+            f'<a href="{safe_link(art["link"])}" target="_blank">{title}</a></div>'
+        ]
+        if summary:
+            text = one_line(art["summary"])
+            preview = text[:SUMMARY_PREVIEW] + ("..." if len(text) > SUMMARY_PREVIEW else "")
+            parts.append(f'<div style="margin: 0.3rem 0; color:#475569; font-size:0.85rem">{html.escape(preview)}</div>')
+        parts.append(f'<div class="news-meta">{self._badge(art["source"])} {html.escape(time_text)}')
+        if copies:
+            # 다른 언론사의 사본은 대표 카드 아래에 언론사 배지(링크)로
+            badges = "".join(self._badge(other["source"], other["link"]) for other in copies)
+            parts.append(f'<div style="margin-top:0.35rem">같은 기사 {badges}</div>')
+        parts.append("</div></div>")
+        return "".join(parts)
+
+    def card(self, art: dict, copies: list = (), summary: bool = True) -> str:
+        key = (summary, art.get("id") or art["link"], tuple(c.get("id") or c["link"] for c in copies))
+        time_text = self.time_of(art)
+        version = (art["title"], art["summary"], time_text)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == version:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+        fragment = self._build(art, copies, summary, time_text)
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = (version, fragment)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return fragment
+
+    def story_list(self, stories: list, summary: bool = True) -> str:
+        """[[대표 기사, 사본...], ...] → 카드 목록 HTML 하나"""
+        return "".join(self.card(story[0], story[1:], summary) for story in stories)
+
+    def article_list(self, articles: list, summary: bool = True) -> str:
+        return "".join(self.card(art, (), summary) for art in articles)
@@ -0,0 +1,670 @@
+"""뉴스 RSS 가져오기 (main_4.py)
+
+피드마다 시간 제한을 두고 여러 피드를 스레드 풀에서 동시에 받습니다.
+느린 언론사 하나가 나머지를 붙잡지 않으므로 새로고침 시간은 가장 느린 피드 하나 정도(최대 timeout)입니다.
+
+기사 시각은 받을 때 한 번만 epoch 초(published_ts)로 바꿔 둡니다.
+feedparser의 published_parsed(UTC)를 먼저 쓰고, 없으면 문자열을 RFC 822 → ISO 8601 순서로 읽습니다.
+읽지 못한 기사는 published_ts가 None이고 저장소가 그 수를 따로 기록합니다.
+
+백그라운드 새로고침(FeedRefresher)은 프로세스에 스레드 하나로 피드마다 정한 간격(+지터)으로 받아
+공유 저장소에 넣고, 실패하면 간격을 늘려 다시 시도합니다. 세션은 저장소만 읽으므로 접속자가 늘어도
+외부 요청 수는 그대로이고 페이지 로딩이 언론사 응답 속도에 묶이지 않습니다.
+
+새로고침할 때마다 피드별로 DNS/연결/응답 대기/받기/파싱 시간, 바이트, 기사 수, HTTP 상태, 캐시 결과, 오류를
+FeedHealth(최근 HEALTH_HISTORY건만 보관하는 링 버퍼)에 기록하므로, 어느 언론사가 느리거나 죽었는지 볼 수 있습니다.
+
+받은 피드는 URL마다 디스크 캐시(data/feed_cache/)에 ETag/Last-Modified와 파싱한 기사 목록을 저장해 두고,
+다음에는 조건부 요청(If-None-Match/If-Modified-Since)을 보냅니다.
+304 Not Modified면 본문을 받지도 파싱하지도 않고, 검증 헤더가 없는 서버는 파싱한 기사의 해시로 바뀌었는지 판단합니다.
+
+본문은 받는 대로 XMLPullParser에 흘려 넣어 RSS/Atom 항목을 파싱하고, 항목 MAX_ENTRIES개를 채우거나
+MAX_FEED_BYTES를 넘으면 나머지는 받지 않습니다. 요약의 태그는 남길 앞부분(SUMMARY_CHARS)까지만 지웁니다.
+깨진 XML은 feedparser(parse_entries)로 다시 파싱합니다.
+
+download, fetch_rss, fetch_all은 앱에서 쓰지 않습니다. 세션이 피드를 직접 받던 예전 방식을
+benchmarks와 tests에서 비교 기준으로 재현하려고 남겨 둡니다.
+"""
+import calendar
+import email.utils
+import hashlib
+import http.client
+import json
+import os
+import random
+import re
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+import xml.etree.ElementTree as ET
+import zlib
+from collections import deque
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+
+import feedparser
+
+FETCH_TIMEOUT = 8        # 피드 하나당 최대 대기 시간(초)
+MAX_WORKERS = 10         # 동시에 받는 피드 수
+MAX_ENTRIES = 20         # 피드마다 보관하는 기사 수
+SUMMARY_CHARS = 200
+MAX_FEED_BYTES = 4 * 1024 * 1024   # 피드 하나에서 읽는 최대 바이트 (gzip을 푼 크기)
+READ_CHUNK = 64 * 1024
+TAG_RE = re.compile(r'<[^>]+>')
+USER_AGENT = "Mozilla/5.0 (news-trend-dashboard)"
+FEED_CACHE_DIR = "data/feed_cache"
+FEED_MAX_AGE = 300       # 이 시간(초) 안에 확인한 피드는 요청하지 않음 (기존 5분 캐시와 같음)
+REFRESH_INTERVAL = FEED_MAX_AGE   # 백그라운드 새로고침 기본 간격(초)
+REFRESH_JITTER = 0.1     # 간격을 ±10% 흔들어 피드 요청이 한꺼번에 몰리지 않게
+RETRY_DELAY = 30         # 처음 실패한 뒤 다시 시도할 때까지(초), 실패할 때마다 두 배
+MAX_BACKOFF = 3600
+HEALTH_HISTORY = 500     # 피드 상태 기록을 최근 몇 건까지 보관할지
+SLOW_FETCH_MS = 3000     # 이보다 오래 걸린 새로고침은 "느림"
+
+
+# ── 받기/파싱 ────────────────────────────────────────────────
+def _elapsed_ms(start: float) -> float:
+    return (time.perf_counter() - start) * 1000
+
+
+def _timed_create_connection(stats: dict, address: tuple, timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
+                             source_address=None):
+    """socket.create_connection 대신: 이름 풀이와 TCP 연결을 나눠 stats에 더함 (리다이렉트면 연결마다 더해짐)"""
+    host, port = address
+    t0 = time.perf_counter()
+    try:
+        addresses = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+    finally:
+        stats["dns_ms"] = stats.get("dns_ms", 0) + _elapsed_ms(t0)
+    t0 = time.perf_counter()
+    error = None
+    for *_, sockaddr in addresses:
+        try:
+            # 숫자 주소라 다시 이름을 풀지 않음
+            sock = socket.create_connection(sockaddr[:2], timeout, source_address)
+        except OSError as e:
+            error = e
+            continue
+        stats["connect_ms"] = stats.get("connect_ms", 0) + _elapsed_ms(t0)
+        return sock
+    raise error or OSError(f"{host}: 주소를 찾지 못함")
+
+
+def _timed_connection(connection_class, stats: dict):
+    """http.client 연결 클래스 대신 넘길 팩토리 (연결의 _create_connection만 바꿔 끼움)"""
+    def make(host, **kwargs):
+        conn = connection_class(host, **kwargs)
+        conn._create_connection = lambda *args: _timed_create_connection(stats, *args)
+        return conn
+    return make
+
+
+class _TimedHTTPHandler(urllib.request.HTTPHandler):
+    def __init__(self, stats: dict):
+        super().__init__()
+        self.stats = stats
+
+    def http_open(self, req):
+        return self.do_open(_timed_connection(http.client.HTTPConnection, self.stats), req)
+
+
+class _TimedHTTPSHandler(urllib.request.HTTPSHandler):
+    def __init__(self, stats: dict):
+        super().__init__()
+        self.stats = stats
+
+    def https_open(self, req):
+        return self.do_open(_timed_connection(http.client.HTTPSConnection, self.stats), req,
+                            context=self._context)
+
+
+def open_feed(url: str, timeout: float = FETCH_TIMEOUT, headers: dict = None, stats: dict = None) -> tuple:
+    """요청만 보내고 → (HTTP 상태, 응답 헤더, 응답) (304면 응답은 None, 본문은 iter_body로 읽음)
+
+    stats를 주면 dns_ms(이름 풀이), connect_ms(TCP 연결), wait_ms(TLS·요청~응답 헤더), status를 기록합니다.
+    단계 시간은 실제로 쓰는 연결 안에서 잽니다 (이름 풀이를 따로 한 번 더 하지 않음).
+    """
+    request = urllib.request.Request(url, headers={
+        "User-Agent": USER_AGENT, "Accept-Encoding": "gzip", **(headers or {})})
+    if stats is None:
+        opener_open = urllib.request.urlopen
+    else:
+        stats["dns_ms"] = stats["connect_ms"] = 0
+        opener_open = urllib.request.build_opener(_TimedHTTPHandler(stats), _TimedHTTPSHandler(stats)).open
+    t0 = time.perf_counter()
+    try:
+        response = opener_open(request, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        if stats is not None:
+            stats["wait_ms"] = _elapsed_ms(t0) - stats["dns_ms"] - stats["connect_ms"]
+            stats["status"] = e.code
+        if e.code == 304:
+            return 304, e.headers, None
+        raise
+    if stats is not None:
+        stats["wait_ms"] = _elapsed_ms(t0) - stats["dns_ms"] - stats["connect_ms"]
+        stats["status"] = response.status
+    return response.status, response.headers, response
+
+
+def _set_read_timeout(response, seconds: float):
+    """http.client 응답의 소켓 timeout을 바꿈 (소켓을 찾지 못하면 urlopen의 timeout 그대로)"""
+    sock = getattr(getattr(getattr(response, "fp", None), "raw", None), "_sock", None)
+    if sock is not None:
+        sock.settimeout(max(0.01, seconds))
+
+
+def iter_body(response, deadline: float, url: str = "", stats: dict = None):
+    """응답 본문을 (gzip이면 풀어서) 조각마다 내줌 — 조금씩 흘려보내는 서버도 deadline(monotonic)을 넘기지 않게 확인
+
+    stats를 주면 읽고 푸는 데 쓴 시간(download_ms)과 받은 바이트(bytes, 압축된 크기)를 더해 갑니다.
+    """
+    if stats is not None:
+        stats.setdefault("download_ms", 0.0)
+        stats.setdefault("bytes", 0)
+    inflate = None
+    if response.headers.get("Content-Encoding", "").lower() == "gzip":
+        inflate = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"{url}: 시간 안에 다 받지 못함")
+        # read(n)은 n바이트가 찰 때까지 기다리므로, 와 있는 만큼만 읽는 read1에 남은 시간을 소켓 timeout으로 걸어 둠
+        _set_read_timeout(response, remaining)
+        t0 = time.perf_counter()
+        chunk = response.read1(READ_CHUNK)
+        if not chunk:
+            break
+        if stats is not None:
+            stats["download_ms"] += _elapsed_ms(t0)
+            stats["bytes"] += len(chunk)
+        if inflate is None:
+            yield chunk
+            continue
+        # 압축률이 아주 높은 본문도 READ_CHUNK씩 풀면서 바로 내줌 (parse_stream이 max_bytes에서 멈추면 더 풀지 않음)
+        pending = chunk
+        while pending:
+            t0 = time.perf_counter()
+            data = inflate.decompress(pending, READ_CHUNK)
+            pending = inflate.unconsumed_tail
+            if stats is not None:
+                stats["download_ms"] += _elapsed_ms(t0)
+            yield data
+    if inflate:
+        yield inflate.flush()
+
+
+def download(url: str, timeout: float = FETCH_TIMEOUT, headers: dict = None) -> tuple:
+    """피드 전체 받기 → (HTTP 상태, 응답 헤더, 본문) (304면 본문은 b"", 벤치마크 비교용)
+
+    timeout이 지나면 socket.timeout / URLError / TimeoutError
+    """
+    deadline = time.monotonic() + timeout
+    status, response_headers, response = open_feed(url, timeout, headers)
+    if response is None:
+        return status, response_headers, b""
+    with response:
+        return status, response_headers, b"".join(iter_body(response, deadline, url))
+
+
+def parse_timestamp(text: str):
+    """날짜 문자열(RFC 822 또는 ISO 8601) → epoch 초 (읽지 못하면 None, 시간대가 없으면 UTC로 봄)"""
+    text = (text or "").strip()
+    if not text:
+        return None
+    try:
+        dt = email.utils.parsedate_to_datetime(text)
+    except (TypeError, ValueError, IndexError):
+        try:
+            dt = datetime.fromisoformat(text)
+        except ValueError:
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def entry_timestamp(entry) -> int:
+    """feedparser 항목의 발행 시각 → epoch 초 (published_parsed/updated_parsed는 UTC struct_time)"""
+    for key in ("published_parsed", "updated_parsed"):
+        parsed = entry.get(key)
+        if parsed:
+            return calendar.timegm(parsed)
+    return parse_timestamp(entry.get("published", entry.get("updated", "")))
+
+
+def parse_entries(data: bytes, source_name: str, limit: int = MAX_ENTRIES) -> list:
+    feed = feedparser.parse(data)
+    articles = []
+    for entry in feed.entries[:limit]:
+        title   = entry.get("title", "")
+        link    = entry.get("link", "#")
+        summary = TAG_RE.sub('', entry.get("summary", ""))[:SUMMARY_CHARS]
+        published = entry.get("published", entry.get("updated", ""))
+        articles.append({
+            "title":        title,
+            "link":         link,
+            "summary":      summary,
+            "published":    published,
+            "published_ts": entry_timestamp(entry),
+            "source":       source_name,
+        })
+    return articles
+
+
+# ── 스트리밍 파싱 ────────────────────────────────────────────
+RSS1_NS = "http://purl.org/rss/1.0/"
+ATOM_NS = "http://www.w3.org/2005/Atom"
+CONTENT_NS = "http://purl.org/rss/1.0/modules/content/"
+DC_NS = "http://purl.org/dc/elements/1.1/"
+ENTRY_TAGS = {("", "item"), (RSS1_NS, "item"), (ATOM_NS, "entry")}   # RSS 2.0/1.0 item, Atom entry
+# 항목 안에서 읽는 태그 → 필드 (media:title, itunes:summary 같은 다른 이름공간은 무시)
+FIELD_TAGS = {
+    ("", "title"): "title", (RSS1_NS, "title"): "title", (ATOM_NS, "title"): "title",
+    ("", "link"): "link", (RSS1_NS, "link"): "link",
+    ("", "guid"): "guid",
+    ("", "description"): "description", (RSS1_NS, "description"): "description",
+    (ATOM_NS, "summary"): "summary", (CONTENT_NS, "encoded"): "encoded", (ATOM_NS, "content"): "content",
+    ("", "pubDate"): "pubDate", (DC_NS, "date"): "date",
+    (ATOM_NS, "published"): "published", (ATOM_NS, "updated"): "updated",
+}
+SUMMARY_FIELDS = ("description", "summary", "encoded", "content")   # 앞에 있는 것을 우선
+DATE_FIELDS = ("pubDate", "published", "date", "updated")
+
+
+def strip_markup(html: str, limit: int = SUMMARY_CHARS) -> str:
+    """태그를 뺀 앞부분 limit 글자 (필요한 앞부분까지만 훑음)"""
+    out, size, pos = [], 0, 0
+    for m in TAG_RE.finditer(html):
+        out.append(html[pos:m.start()])
+        size += m.start() - pos
+        pos = m.end()
+        if size >= limit:
+            break
+    else:
+        out.append(html[pos:])
+    return "".join(out)[:limit]
+
+
+def _qname(tag: str) -> tuple:
+    """"{이름공간}이름" → (이름공간, 이름) (이름공간이 없으면 "")"""
+    if tag.startswith("{"):
+        ns, local = tag[1:].split("}", 1)
+        return ns, local
+    return "", tag
+
+
+def _entry_article(fields: dict, links: list, guid_link: str, source_name: str) -> dict:
+    # 링크 우선순위: <link> 글자 → Atom rel="alternate" → 다른 Atom 링크 → 고유 링크인 <guid>
+    link = fields.get("link") or next(
+        (href for rel, href in links if rel in (None, "alternate")),
+        links[0][1] if links else guid_link or "#")
+    summary = next((fields[f] for f in SUMMARY_FIELDS if fields.get(f)), "")
+    published = next((fields[f] for f in DATE_FIELDS if fields.get(f)), "")
+    return {
+        "title":        fields.get("title", ""),
+        "link":         link,
+        "summary":      strip_markup(summary),
+        "published":    published,
+        "published_ts": parse_timestamp(published),
+        "source":       source_name,
+    }
+
+
+def parse_stream(chunks, source_name: str, limit: int = MAX_ENTRIES,
+                 max_bytes: int = MAX_FEED_BYTES) -> tuple:
+    """본문 조각을 읽으면서 RSS/Atom 항목을 파싱 → (기사 목록, 읽은 바이트 수)
+
+    항목 limit개를 채우거나 max_bytes를 넘으면 나머지는 읽지 않습니다.
+    XML이 깨져 있거나 expat이 읽지 못하는 멀티바이트 인코딩(euc-kr, cp949 등)이면
+    (max_bytes까지 마저 읽어) feedparser로 다시 파싱합니다.
+    """
+    chunks = iter(chunks)   # 다시 파싱할 때 이미 읽은 조각부터 다시 돌지 않도록 (리스트를 받아도)
+    parser = ET.XMLPullParser(events=("start", "end"))
+    consumed, size = [], 0
+    articles, stack = [], []
+    fields, links, guid_link = None, [], None
+    try:
+        for chunk in chunks:
+            consumed.append(chunk)
+            size += len(chunk)
+            parser.feed(chunk)
+            for event, elem in parser.read_events():
+                tag = _qname(elem.tag)
+                if event == "start":
+                    stack.append(tag)
+                    if tag in ENTRY_TAGS:
+                        fields, links, guid_link = {}, [], None
+                    continue
+                stack.pop()
+                if tag in ENTRY_TAGS and fields is not None:
+                    articles.append(_entry_article(fields, links, guid_link, source_name))
+                    fields = None
+                    elem.clear()
+                    if len(articles) >= limit:
+                        return articles, size
+                elif fields is not None and stack and stack[-1] in ENTRY_TAGS:
+                    if tag == (ATOM_NS, "link"):
+                        if elem.get("href"):
+                            links.append((elem.get("rel"), elem.get("href")))
+                        continue
+                    field = FIELD_TAGS.get(tag)
+                    if field is None or field in fields:
+                        continue
+                    fields[field] = "".join(elem.itertext()).strip()
+                    # RSS 2.0 guid는 isPermaLink="false"가 아니면 기사 주소
+                    if (field == "guid" and elem.get("isPermaLink", "true").lower() != "false"
+                            and fields[field].lower().startswith(("http://", "https://"))):
+                        guid_link = fields[field]
+            if size >= max_bytes:
+                break
+        parser.close()
+    except (ET.ParseError, ValueError):
+        for chunk in chunks:
+            if size >= max_bytes:
+                break
+            consumed.append(chunk)
+            size += len(chunk)
+        return parse_entries(b"".join(consumed), source_name, limit), size
+    return articles, size
+
+
+# ── 디스크 캐시 ──────────────────────────────────────────────
+class FeedCache:
+    """URL마다 검증 헤더(ETag/Last-Modified), 본문 해시, 파싱한 기사 목록을 JSON 파일로 저장"""
+
+    def __init__(self, cache_dir: str = FEED_CACHE_DIR, max_age: float = FEED_MAX_AGE):
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, url: str) -> dict:
+        try:
+            with open(self.path(url), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, url: str, entry: dict):
+        path = self.path(url)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+def fetch_feed(url: str, source_name: str, cache: FeedCache = None,
+               timeout: float = FETCH_TIMEOUT, force: bool = False, stats: dict = None) -> tuple:
+    """피드 하나 → (기사 목록, 캐시 결과) — 캐시 결과는 "fresh"/"not_modified"/"unchanged"/"updated"/"miss"
+
+    cache가 없으면 항상 전체를 받아 파싱("miss")합니다.
+    force면 max_age 안에 확인한 피드도 (조건부 요청으로) 다시 확인합니다.
+    stats(dict)를 주면 단계별 시간/바이트/상태와 parse_ms, entries, outcome을 채웁니다.
+    """
+    entry = cache.get(url) if cache is not None else None
+    now = time.time()
+    if entry is not None and not force and now - entry["checked_at"] < cache.max_age:
+        if stats is not None:
+            stats.update(outcome="fresh", entries=len(entry["articles"]))
+        return entry["articles"], "fresh"
+
+    headers = {}
+    if entry is not None:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    deadline = time.monotonic() + timeout
+    status, response_headers, response = open_feed(url, timeout, headers, stats)
+
+    if response is None and entry is not None:
+        outcome, articles = "not_modified", entry["articles"]
+    else:
+        # 본문은 필요한 항목 수만큼만 읽으면서 파싱 (어디까지 읽을지는 조각 경계에 따라 달라지므로 해시는 파싱 결과로)
+        articles = []
+        if response is not None:
+            with response:
+                t0 = time.perf_counter()
+                articles, _ = parse_stream(iter_body(response, deadline, url, stats), source_name)
+                if stats is not None:   # 받기와 파싱이 번갈아 일어나므로 파싱 시간 = 전체 - 받기
+                    stats["parse_ms"] = _elapsed_ms(t0) - stats.get("download_ms", 0.0)
+        content_hash = hashlib.sha1(json.dumps(articles, ensure_ascii=False).encode("utf-8")).hexdigest()
+        if entry is not None and entry.get("content_hash") == content_hash:
+            outcome, articles = "unchanged", entry["articles"]   # 검증 헤더가 없는 서버
+        else:
+            outcome = "updated" if entry is not None else "miss"
+        entry = {
+            "url": url,
+            "etag": response_headers.get("ETag"),
+            "last_modified": response_headers.get("Last-Modified"),
+            "content_hash": content_hash,
+            "fetched_at": now,
+            "articles": articles,
+        }
+    if cache is not None:
+        cache.put(url, dict(entry, checked_at=now))
+    if stats is not None:
+        stats.update(outcome=outcome, entries=len(articles))
+    return articles, outcome
+
+
+def fetch_rss(url: str, source_name: str, timeout: float = FETCH_TIMEOUT, cache: FeedCache = None) -> list:
+    """피드 하나 → 기사 목록, 실패하면 캐시의 지난 기사나 [] (예전 세션별 받기, 벤치마크 비교용)"""
+    try:
+        return fetch_feed(url, source_name, cache, timeout)[0]
+    except Exception:
+        # 받지 못하면 디스크에 남아 있는 지난 기사라도 보여 줌
+        entry = cache.get(url) if cache is not None else None
+        return entry["articles"] if entry is not None else []
+
+
+# ── 동시 받기 (예전 세션별 받기, 벤치마크/테스트 비교용) ─────
+def fetch_all(sources: dict, fetch=fetch_rss, timeout: float = FETCH_TIMEOUT,
+              max_workers: int = MAX_WORKERS):
+    """{언론사: URL}을 동시에 받으면서 끝나는 순서대로 (언론사, 기사 목록)을 내줌
+
+    timeout(+1초) 안에 끝나지 않은 피드는 빈 목록으로 내주고 기다리지 않습니다.
+    """
+    if not sources:
+        return
+    pool = ThreadPoolExecutor(max_workers=min(max_workers, len(sources)))
+    futures = {pool.submit(fetch, url, name): name for name, url in sources.items()}
+    pending = set(futures.values())
+    try:
+        for future in as_completed(futures, timeout=timeout + 1):
+            name = futures[future]
+            pending.discard(name)
+            try:
+                yield name, future.result()
+            except Exception:
+                yield name, []
+    except FuturesTimeout:
+        for name in sources:
+            if name in pending:
+                yield name, []
+    finally:
+        # 늦은 스레드는 기다리지 않음 (각자 socket timeout으로 곧 끝남)
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+# ── 피드 상태 기록 ───────────────────────────────────────────
+class FeedHealth:
+    """피드 받기 기록의 링 버퍼 (최근 maxlen건, 스레드 안전)
+
+    기록 하나: source, url, started_at, total_ms, dns_ms, connect_ms, wait_ms, download_ms, parse_ms,
+    bytes, entries, added, status, outcome, error
+    """
+
+    def __init__(self, maxlen: int = HEALTH_HISTORY):
+        self._records = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def record(self, stats: dict):
+        with self._lock:
+            self._records.append(dict(stats))
+
+    def records(self, source: str = None) -> list:
+        """오래된 것부터"""
+        with self._lock:
+            return [dict(r) for r in self._records if source is None or r["source"] == source]
+
+    def summary(self, sources: list = None) -> list:
+        """언론사별 마지막 기록 + 보관 중인 기록의 p95 시간·연속 실패 수 (실패한 피드, 마지막 시간이 긴 순서)"""
+        by_source = {}
+        for r in self.records():
+            if sources is None or r["source"] in sources:
+                by_source.setdefault(r["source"], []).append(r)
+        rows = []
+        for source, history in by_source.items():
+            last = history[-1]
+            times = sorted(r["total_ms"] for r in history)
+            failures = 0
+            for r in reversed(history):
+                if not r.get("error"):
+                    break
+                failures += 1
+            health = "error" if last.get("error") else "slow" if last["total_ms"] > SLOW_FETCH_MS else "ok"
+            rows.append({
+                "source": source, "health": health, "last_ms": last["total_ms"],
+                "p95_ms": times[min(len(times) - 1, int(len(times) * 0.95))], "samples": len(history),
+                "dns_ms": last.get("dns_ms"), "connect_ms": last.get("connect_ms"), "wait_ms": last.get("wait_ms"),
+                "download_ms": last.get("download_ms"), "parse_ms": last.get("parse_ms"),
+                "bytes": last.get("bytes"), "entries": last.get("entries"), "status": last.get("status"),
+                "outcome": last.get("outcome"), "failures": failures, "error": last.get("error"),
+                "at": last["started_at"],
+            })
+        return sorted(rows, key=lambda row: (row["health"] != "error", -row["last_ms"]))
+
+    def export_json(self) -> str:
+        return json.dumps({"exported_at": time.time(), "records": self.records()},
+                          ensure_ascii=False, indent=1)
+
+
+# ── 백그라운드 새로고침 ──────────────────────────────────────
+class FeedRefresher:
+    """{언론사: URL}을 언론사마다 정한 간격으로 받아 store.upsert() 하는 프로세스 공유 스케줄러
+
+    스케줄러 스레드 하나가 때가 된 피드를 스레드 풀에 넘기고, 다음 시각은
+    성공하면 간격 × (1 ± jitter), 실패하면 RETRY_DELAY × 2^(연속 실패 - 1) (최대 max_backoff) 뒤입니다.
+    받는 중에 refresh_now가 불리면 그 받기가 끝나자마자 한 번 더 받습니다.
+    """
+
+    def __init__(self, sources: dict, store, cache: FeedCache = None, intervals: dict = None,
+                 interval: float = REFRESH_INTERVAL, jitter: float = REFRESH_JITTER,
+                 max_backoff: float = MAX_BACKOFF, timeout: float = FETCH_TIMEOUT,
+                 max_workers: int = MAX_WORKERS, fetch=fetch_feed, health: FeedHealth = None):
+        self.sources = dict(sources)
+        self.health = health if health is not None else FeedHealth()
+        self.store = store
+        self.cache = cache
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.fetch = fetch
+        self._rng = random.Random()
+        now = time.time()
+        self.state = {name: {"interval": (intervals or {}).get(name, interval), "next": now,
+                             "failures": 0, "started_at": None, "finished_at": None, "last_ok": None,
+                             "last_error": None, "added": 0, "rerun": False}
+                      for name in self.sources}
+        self._running = set()
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._pool = ThreadPoolExecutor(max_workers=min(max_workers, max(1, len(self.sources))))
+        self._thread = threading.Thread(target=self._run, name="feed-refresher", daemon=True)
+
+    def start(self) -> "FeedRefresher":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self._thread.join()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self):
+        with self._cond:
+            while not self._stopped:
+                now = time.time()
+                for name, entry in self.state.items():
+                    if name not in self._running and entry["next"] <= now:
+                        self._running.add(name)
+                        entry["started_at"] = now
+                        self._pool.submit(self._refresh, name)
+                waiting = [entry["next"] for name, entry in self.state.items() if name not in self._running]
+                self._cond.wait(timeout=max(0.05, min(waiting) - now) if waiting else None)
+
+    def _refresh(self, name: str):
+        error, added = None, 0
+        stats = {"source": name, "url": self.sources[name], "started_at": time.time()}
+        t0 = time.perf_counter()
+        try:
+            articles, _ = self.fetch(self.sources[name], name, self.cache, self.timeout, force=True, stats=stats)
+            added = self.store.upsert(articles)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        self.health.record(dict(stats, total_ms=_elapsed_ms(t0), added=added, error=error))
+        now = time.time()
+        with self._cond:
+            entry = self.state[name]
+            entry["finished_at"] = now
+            if error is None:
+                entry["failures"] = 0
+                entry["last_ok"] = now
+                entry["added"] += added
+                delay = entry["interval"] * (1 + self._rng.uniform(-self.jitter, self.jitter))
+            else:
+                entry["failures"] += 1
+                entry["last_error"] = error
+                delay = min(self.max_backoff, RETRY_DELAY * 2 ** (entry["failures"] - 1))
+                delay *= 1 + self._rng.uniform(0, self.jitter)
+            # 받는 중에 새로고침을 요청받았으면 바로 다시 받음
+            entry["next"] = now if entry["rerun"] else now + delay
+            entry["rerun"] = False
+            self._running.discard(name)
+            self._cond.notify_all()
+
+    def refresh_now(self, names: list = None, wait: float = None) -> bool:
+        """지금 바로 받도록 앞당김 → 요청한 뒤에 시작한 받기가 wait초 안에 모두 끝났으면 True
+        (wait가 None이면 기다리지 않음)
+
+        이미 받는 중인 피드는 요청 전에 시작한 받기이므로, 끝나는 대로 다시 받도록 표시만 해 둡니다.
+        """
+        names = list(self.state) if names is None else [n for n in names if n in self.state]
+        requested = time.time()
+        with self._cond:
+            for name in names:
+                entry = self.state[name]
+                if name in self._running:
+                    if entry["started_at"] < requested:
+                        entry["rerun"] = True
+                else:
+                    entry["next"] = min(entry["next"], requested)
+            self._cond.notify_all()
+            if wait is None:
+                return False
+            return self._cond.wait_for(
+                lambda: all(n not in self._running and (self.state[n]["started_at"] or 0) >= requested
+                            for n in names), wait)
+
+    def wait_ready(self, names: list = None, timeout: float = None) -> bool:
+        """각 피드를 적어도 한 번 받아 볼 때까지 기다림 (처음 띄운 직후 저장소가 비어 있을 때)"""
+        names = list(self.state) if names is None else [n for n in names if n in self.state]
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: all(self.state[n]["finished_at"] is not None for n in names), timeout)
+
+    def last_refresh(self, names: list = None) -> float:
+        """이 피드들을 마지막으로 확인한 시각 (아직 없으면 None)"""
+        names = list(self.state) if names is None else names
+        with self._cond:
+            times = [self.state[n]["finished_at"] for n in names if n in self.state]
+        times = [t for t in times if t is not None]
+        return max(times) if times else None
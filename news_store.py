@@ -0,0 +1,191 @@
+"""뉴스 기사 저장소 (SQLite, main_4.py)
+
+새로고침할 때마다 받은 기사를 정규화한 링크의 해시를 키로 upsert 합니다 (링크가 없는 기사는 언론사+제목).
+같은 기사를 여러 번 받아도 한 행만 남고(멱등), 피드당 최신 20개를 넘는 지난 기사도 계속 쌓입니다.
+기간/언론사 조건은 색인으로 찾으므로 며칠치 기사도 다시 받지 않고 바로 보여 줄 수 있고,
+세션은 화면에 필요한 만큼만 조회해서 쓰므로 세션 메모리가 기사 수에 따라 늘지 않습니다.
+
+발행 시각은 저장할 때 epoch 초(published_ts)로 정규화하고 색인을 두므로, 최신순 정렬과 기간 조회에
+날짜 문자열을 다시 읽지 않습니다. 날짜를 읽지 못한 기사는 date_ok=0으로 표시하고 처음 받은 시각을 씁니다.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import news_feeds
+
+DB_PATH = "data/news.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id         TEXT PRIMARY KEY,   -- 정규화한 링크의 sha1 (링크가 없으면 언론사+제목의 sha1)
+    link       TEXT NOT NULL,
+    title      TEXT NOT NULL,
+    summary    TEXT NOT NULL,
+    published  TEXT NOT NULL,
+    source     TEXT NOT NULL,
+    first_seen INTEGER NOT NULL,   -- 처음 받은 시각 (epoch 초)
+    last_seen  INTEGER NOT NULL,   -- 마지막으로 피드에 보인 시각
+    published_ts INTEGER,          -- 발행 시각 (epoch 초, 읽지 못했으면 first_seen, first_seen보다 늦지 않음)
+    date_ok    INTEGER             -- 발행 시각 문자열을 읽었으면 1
+);
+"""
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_articles_seen ON articles (first_seen);
+CREATE INDEX IF NOT EXISTS idx_articles_source_seen ON articles (source, first_seen);
+CREATE INDEX IF NOT EXISTS idx_articles_published ON articles (published_ts);
+CREATE INDEX IF NOT EXISTS idx_articles_source_published ON articles (source, published_ts);
+CREATE INDEX IF NOT EXISTS idx_articles_last_seen ON articles (last_seen);
+"""
+
+TIME_COLUMNS = ("published_ts", "first_seen", "last_seen")
+
+# 링크에서 지우는 추적용 쿼리 파라미터
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid")
+
+
+def normalize_link(link: str) -> str:
+    """같은 기사를 가리키는 링크를 하나로 (scheme/host 소문자, fragment·추적 파라미터·끝 "/" 제거)"""
+    parts = urlsplit(link.strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if not k.lower().startswith(TRACKING_PARAMS)]
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(sorted(query)), ""))
+
+
+def article_id(link: str) -> str:
+    return hashlib.sha1(normalize_link(link).encode("utf-8")).hexdigest()
+
+
+def has_link(link: str) -> bool:
+    """"#"이나 빈 문자열 같은 자리표시가 아닌 실제 http(s) 링크인지"""
+    parts = urlsplit((link or "").strip())
+    return parts.scheme.lower() in ("http", "https") and bool(parts.netloc)
+
+
+def article_key(article: dict) -> str:
+    """저장 키 — 링크가 없는 기사는 모두 같은 키("/")가 되지 않도록 언론사+제목으로 (제목도 없으면 None)"""
+    if has_link(article.get("link")):
+        return article_id(article["link"])
+    if not article.get("title", "").strip():
+        return None
+    key = f"{article['source']}\n{article['title'].strip()}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def published_ts(article: dict):
+    """기사의 발행 시각(epoch 초, 못 읽으면 None) — 예전 피드 캐시처럼 published_ts가 없으면 문자열에서 읽음"""
+    if "published_ts" in article:
+        return article["published_ts"]
+    return news_feeds.parse_timestamp(article.get("published", ""))
+
+
+class ArticleStore:
+    """스레드 사이에서 공유하는 SQLite 기사 저장소 (쓰기는 잠금으로 직렬화)"""
+
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            self._migrate()
+            self._conn.executescript(INDEXES)
+
+    def _migrate(self):
+        """발행 시각 열이 없던 저장소: 열을 추가하고 저장된 날짜 문자열을 한 번 읽어 채움"""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(articles)")}
+        for column in ("published_ts", "date_ok"):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE articles ADD COLUMN {column} INTEGER")
+        rows = self._conn.execute(
+            "SELECT id, published, first_seen FROM articles WHERE published_ts IS NULL").fetchall()
+        updates = []
+        for row in rows:
+            ts = news_feeds.parse_timestamp(row["published"])
+            updates.append((min(ts, row["first_seen"]) if ts is not None else row["first_seen"],
+                            int(ts is not None), row["id"]))
+        self._conn.executemany("UPDATE articles SET published_ts = ?, date_ok = ? WHERE id = ?", updates)
+
+    def upsert(self, articles: list, now: float = None) -> int:
+        """기사 목록 저장 (이미 있으면 내용과 last_seen만 갱신) → 새로 추가된 기사 수
+
+        발행 시각을 읽지 못한 기사는 처음 받은 시각으로, 그보다 늦은(미래) 시각은 처음 받은 시각으로 맞춥니다.
+        """
+        now = int(now if now is not None else time.time())
+        rows = []
+        for a in articles:
+            key = article_key(a)
+            if key is None:
+                continue
+            ts = published_ts(a)
+            rows.append((key, a.get("link") or "#", a["title"], a["summary"], a["published"],
+                         a["source"], now, now, min(ts, now) if ts is not None else None))
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany("""
+                INSERT INTO articles (id, link, title, summary, published, source, first_seen, last_seen,
+                                      published_ts, date_ok)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, COALESCE(?9, ?7), ?9 IS NOT NULL)
+                ON CONFLICT(id) DO NOTHING""", rows)
+            added = self._conn.total_changes - before
+            # 이번에 날짜를 읽지 못했으면 저장된 발행 시각을 그대로 둠 (처음 받은 시각보다 늦을 수는 없음)
+            self._conn.executemany("""
+                UPDATE articles SET title = ?, summary = ?, published = ?, last_seen = ?,
+                                    published_ts = COALESCE(MIN(?5, first_seen), published_ts),
+                                    date_ok = CASE WHEN ?5 IS NULL THEN date_ok ELSE 1 END
+                WHERE id = ?6""", [(r[2], r[3], r[4], now, r[8], r[0]) for r in rows])
+        return added
+
+    def _where(self, sources, since, until, by: str = "published_ts") -> tuple:
+        if by not in TIME_COLUMNS:
+            raise ValueError(f"정렬/기간 기준은 {TIME_COLUMNS} 중 하나: {by!r}")
+        clauses, params = [], []
+        if sources is not None:
+            clauses.append(f"source IN ({','.join('?' * len(sources))})")
+            params.extend(sources)
+        if since is not None:
+            clauses.append(f"{by} >= ?")
+            params.append(int(since))
+        if until is not None:
+            clauses.append(f"{by} < ?")
+            params.append(int(until))
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def query(self, sources: list = None, since: float = None, until: float = None,
+              limit: int = None, by: str = "published_ts") -> list:
+        """조건에 맞는 기사 dict 목록 (by 시각의 역순 — 기본은 발행 시각 최신순)
+
+        by="first_seen"이면 처음 받은 시각 기준 (같은 새로고침 안에서는 받은 순서),
+        by="last_seen"이면 마지막으로 받은(내용이 갱신됐을 수 있는) 시각 기준
+        """
+        where, params = self._where(sources, since, until, by)
+        sql = (f"SELECT id, link, title, summary, published, source, first_seen, last_seen, published_ts,"
+               f" date_ok FROM articles{where} ORDER BY {by} DESC, rowid")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def count(self, sources: list = None, since: float = None, until: float = None,
+              by: str = "published_ts") -> int:
+        where, params = self._where(sources, since, until, by)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM articles{where}", params).fetchone()[0]
+
+    def date_failures(self, sources: list = None) -> int:
+        """발행 시각을 읽지 못한 기사 수"""
+        where, params = self._where(sources, None, None)
+        where += (" AND" if where else " WHERE") + " date_ok = 0"
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM articles{where}", params).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,396 @@
+"""뉴스 텍스트 처리 (main_4.py)
+
+단어 빈도는 기사마다 한 번만 세어 기사 id로 캐시해 두고, 전체/언론사별 합계는
+기사가 들어오거나 빠질 때 그 기사의 빈도만 더하고 빼서 갱신합니다 (rerun 비용 = 바뀐 기사 수).
+캐시는 (제목, 요약)을 버전으로 함께 저장하므로 새로고침에서 제목이 고쳐진 기사는 다시 셉니다.
+
+급상승 단어는 시간 단위(기본 1시간) 버킷마다 언론사별 단어 수를 세어 두고,
+최근 구간의 빈도가 그 앞 기준 구간에서 기대되는 빈도보다 크게 뛴 단어를 찾습니다.
+보관 기간이 지난 버킷은 통째로 버리므로 몇 주치를 다뤄도 메모리는 보관 기간만큼으로 제한됩니다.
+
+여러 언론사에 실린 같은 기사(거의 같은 제목/요약)는 글자 3-gram 집합의 MinHash 서명을
+LSH 밴드로 나눠 같은 버킷에 들어온 기사끼리만 비교해서 묶습니다 (모든 쌍을 비교하지 않음).
+
+관심 키워드 여러 개를 Aho–Corasick 오토마톤 하나로 컴파일해서, 기사마다 제목+요약을 한 번만 훑어
+모든 키워드의 매치를 한꺼번에 찾습니다. 비용은 키워드 수와 상관없이 텍스트 길이에 비례하고,
+기사별 매치 결과는 기사 id와 버전으로 캐시해 두므로 rerun 때 이미 본 기사는 다시 훑지 않습니다.
+"""
+import math
+import re
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict, deque
+
+import numpy as np
+
+MATCH_CACHE_SIZE = 50000   # 기사별 매치 결과를 기억하는 최대 기사 수
+TOKEN_CACHE_SIZE = 50000   # 기사별 단어 빈도를 기억하는 최대 기사 수
+WORD_RE = re.compile(r'[가-힣a-zA-Z]{2,10}')
+TREND_BUCKET_SECONDS = 3600      # 급상승 단어 버킷 크기 (1시간)
+TREND_RETENTION_BUCKETS = 24 * 21   # 보관하는 버킷 수 (3주)
+MINHASH_PERM = 64         # MinHash 서명 길이
+LSH_BANDS = 16            # 밴드 16개 × 4행 → 자카드 유사도 약 0.5부터 후보가 됨
+DUP_THRESHOLD = 0.5       # 서명으로 추정한 자카드 유사도가 이 이상이면 같은 기사
+SHINGLE_SIZE = 3
+
+
+# ── 단어 빈도 ────────────────────────────────────────────────
+def _article_id(article: dict):
+    return article.get("id") or article.get("link")
+
+
+def _article_version(article: dict) -> tuple:
+    """캐시한 결과가 아직 맞는지 보는 값 (저장소가 새로고침마다 제목/요약을 덮어씀)"""
+    return article["title"], article["summary"]
+
+
+def count_words(article: dict, stopwords=frozenset()) -> Counter:
+    """기사 하나의 제목+요약 단어 빈도 (main_4.py의 기존 extract_words와 같은 기준)"""
+    words = WORD_RE.findall(article["title"] + " " + article["summary"])
+    return Counter(w for w in words if w.lower() not in stopwords)
+
+
+class TokenCache:
+    """기사 id → (버전, 단어 빈도) (프로세스 전체 공유, 크기 제한 LRU, 스레드 안전)"""
+
+    def __init__(self, stopwords=frozenset(), capacity: int = TOKEN_CACHE_SIZE):
+        self.stopwords = frozenset(stopwords)
+        self.capacity = capacity
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, article: dict) -> Counter:
+        key, version = _article_id(article), _article_version(article)
+        with self._lock:
+            cached = self._items.get(key)
+            if cached is not None and cached[0] == version:
+                self._items.move_to_end(key)
+                return cached[1]
+        counts = count_words(article, self.stopwords)
+        with self._lock:
+            self._items[key] = (version, counts)
+            self._items.move_to_end(key)
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+        return counts
+
+
+def _add(total: Counter, counts: Counter, sign: int):
+    for word, n in counts.items():
+        v = total[word] + sign * n
+        if v > 0:
+            total[word] = v
+        else:
+            del total[word]
+
+
+class WordFrequency:
+    """지금 보고 있는 기사 집합의 전체/언론사별 단어 빈도 (기사 추가/만료 시 증분 갱신)"""
+
+    def __init__(self, tokens: TokenCache):
+        self.tokens = tokens
+        self.total = Counter()
+        self.by_source = {}
+        self._articles = {}    # 기사 id → (언론사, 버전, 단어 빈도)
+        self._top = {}         # (언론사, n) → most_common 결과 (바뀌면 비움)
+
+    def update(self, articles: list) -> "WordFrequency":
+        """기사 목록을 지금 집합으로 (새 기사는 더하고, 빠진 기사는 빼고, 제목/요약이 바뀐 기사는 다시 셈)"""
+        current = {_article_id(a): a for a in articles}
+        removed = [key for key, (_, version, _) in self._articles.items()
+                   if key not in current or _article_version(current[key]) != version]
+        for key in removed:
+            source, _, counts = self._articles.pop(key)
+            _add(self.total, counts, -1)
+            _add(self.by_source[source], counts, -1)
+        added = [a for key, a in current.items() if key not in self._articles]
+        for article in added:
+            counts = self.tokens.get(article)
+            self._articles[_article_id(article)] = (article["source"], _article_version(article), counts)
+            _add(self.total, counts, 1)
+            _add(self.by_source.setdefault(article["source"], Counter()), counts, 1)
+        if removed or added:
+            self._top.clear()
+        return self
+
+    def most_common(self, n: int, source: str = None) -> list:
+        key = (source, n)
+        if key not in self._top:
+            counter = self.total if source is None else self.by_source.get(source, Counter())
+            self._top[key] = counter.most_common(n)
+        return self._top[key]
+
+
+# ── 급상승 단어 ──────────────────────────────────────────────
+class TrendTracker:
+    """시간 버킷별·언론사별 단어 수 (보관 기간이 지난 버킷은 버림, 스레드 안전)
+
+    기사 시각은 article[time_key](epoch 초)로 버킷을 정하고, 같은 기사는 한 번만 셉니다
+    (제목/요약이 바뀌어 다시 들어오면 예전 빈도를 빼고 새로 셈).
+    synced_until은 article[cursor_key]의 최댓값이라 저장소에서 그 뒤에 들어온 기사만 다시 조회할 수 있습니다.
+    """
+
+    def __init__(self, tokens: TokenCache, bucket_seconds: int = TREND_BUCKET_SECONDS,
+                 retention: int = TREND_RETENTION_BUCKETS, time_key: str = "first_seen",
+                 cursor_key: str = "first_seen"):
+        self.tokens = tokens
+        self.bucket_seconds = bucket_seconds
+        self.retention = retention
+        self.time_key = time_key
+        self.cursor_key = cursor_key
+        self.synced_until = 0      # 여기까지(cursor_key, epoch 초)의 기사는 반영함
+        self._buckets = {}         # 버킷 번호 → {언론사: Counter}
+        self._ids = {}             # 버킷 번호 → 그 버킷에 센 기사 id 집합
+        self._seen = {}            # 기사 id → (버킷, 언론사, 버전, 단어 빈도)
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def bucket_of(self, ts: float) -> int:
+        return int(ts // self.bucket_seconds)
+
+    def add(self, articles: list, now: float = None) -> int:
+        """기사 추가 → 새로 센 기사 수 (보관 기간 밖의 기사는 무시)"""
+        now = time.time() if now is None else now
+        oldest = self.bucket_of(now) - self.retention + 1
+        added = 0
+        with self._lock:
+            for article in articles:
+                key = _article_id(article)
+                ts = article.get(self.time_key)
+                cursor = article.get(self.cursor_key)
+                if cursor is not None:   # 세지 않는 기사(오래됨/이미 셈)도 조회 커서는 넘김
+                    self.synced_until = max(self.synced_until, cursor)
+                if ts is None:
+                    continue
+                version = _article_version(article)
+                seen = self._seen.get(key)
+                if seen is not None:
+                    if seen[2] == version:
+                        continue
+                    self._forget(key)   # 제목/요약이 바뀐 기사: 예전 빈도를 빼고 다시 셈
+                bucket = self.bucket_of(ts)
+                if bucket < oldest:
+                    continue
+                counts = self.tokens.get(article)
+                source_counts = self._buckets.setdefault(bucket, {})
+                source_counts.setdefault(article["source"], Counter()).update(counts)
+                self._ids.setdefault(bucket, set()).add(key)
+                self._seen[key] = (bucket, article["source"], version, counts)
+                added += 1
+            self._expire(oldest)
+            if added:
+                self._cache.clear()
+        return added
+
+    def _forget(self, key):
+        bucket, source, _, counts = self._seen.pop(key)
+        source_counts = self._buckets.get(bucket, {})
+        if source in source_counts:
+            _add(source_counts[source], counts, -1)
+        self._ids.get(bucket, set()).discard(key)
+
+    def _expire(self, oldest: int):
+        for bucket in [b for b in self._buckets if b < oldest]:
+            del self._buckets[bucket]
+            for key in self._ids.pop(bucket, set()):
+                del self._seen[key]
+
+    def _sum(self, first: int, last: int, source: str) -> Counter:
+        total = Counter()
+        for bucket in range(first, last + 1):
+            for src, counts in self._buckets.get(bucket, {}).items():
+                if source is None or src == source:
+                    total.update(counts)
+        return total
+
+    def trending(self, window_hours: float = 3, baseline_hours: float = 72, source: str = None,
+                 min_count: int = 3, limit: int = 20, now: float = None) -> list:
+        """최근 window_hours 동안 바로 앞 baseline_hours보다 빈도가 뛴 단어
+
+        → [(단어, 최근 횟수, 기대 횟수, 점수)] 점수 순. 기대 횟수는 기준 구간의 시간당 빈도 × 최근 구간 길이,
+        점수는 (최근 - 기대) / sqrt(기대 + 1) (포아송 근사 z 점수)
+        """
+        now = time.time() if now is None else now
+        current = self.bucket_of(now)
+        n_window = max(1, round(window_hours * 3600 / self.bucket_seconds))
+        n_baseline = max(1, round(baseline_hours * 3600 / self.bucket_seconds))
+        key = (current, n_window, n_baseline, source, min_count, limit)
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+            recent = self._sum(current - n_window + 1, current, source)
+            baseline = self._sum(current - n_window - n_baseline + 1, current - n_window, source)
+            scale = n_window / n_baseline
+            rows = []
+            for word, count in recent.items():
+                if count < min_count:
+                    continue
+                expected = baseline.get(word, 0) * scale
+                rows.append((word, count, expected, (count - expected) / math.sqrt(expected + 1)))
+            rows.sort(key=lambda r: -r[3])
+            self._cache[key] = rows = rows[:limit]
+        return rows
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "buckets": len(self._buckets),
+                "articles": len(self._seen),
+                "cells": sum(len(c) for sources in self._buckets.values() for c in sources.values()),
+            }
+
+
+# ── 중복 기사 묶기 ───────────────────────────────────────────
+def shingles(text: str, k: int = SHINGLE_SIZE) -> set:
+    """공백을 하나로 줄인 소문자 텍스트의 글자 k-gram 집합"""
+    text = " ".join(text.lower().split())
+    if len(text) <= k:
+        return {text} if text else set()
+    return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+
+class StoryClusterer:
+    """MinHash + LSH로 거의 같은 기사를 묶음 (기사별 서명은 id와 버전으로 캐시)"""
+
+    _PRIME = 4294967311   # 2^32보다 큰 소수
+
+    def __init__(self, num_perm: int = MINHASH_PERM, bands: int = LSH_BANDS,
+                 threshold: float = DUP_THRESHOLD, seed: int = 1, cache_size: int = TOKEN_CACHE_SIZE):
+        rng = np.random.default_rng(seed)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self._a = rng.integers(1, 2 ** 32, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 2 ** 32, num_perm, dtype=np.uint64)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def signature(self, text: str) -> np.ndarray:
+        grams = shingles(text)
+        if not grams:
+            return np.full(len(self._a), self._PRIME, dtype=np.uint64)
+        x = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+        # (a·x + b) mod p 를 순열 대신 쓰고 순열마다 최솟값 (a, x < 2^32 이라 uint64에서 넘치지 않음)
+        return ((self._a[:, None] * x[None, :] + self._b[:, None]) % self._PRIME).min(axis=1)
+
+    def article_signature(self, article: dict) -> np.ndarray:
+        key, version = _article_id(article), _article_version(article)
+        with self._lock:
+            cached = self._cache.get(key)
+        sig = cached[1] if cached is not None and cached[0] == version else None
+        if sig is None:
+            sig = self.signature(article["title"] + " " + article["summary"])
+            with self._lock:
+                self._cache[key] = (version, sig)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return sig
+
+    def cluster(self, articles: list) -> list:
+        """기사 목록 → 묶음(기사 번호 목록)의 목록 (묶음과 묶음 안의 순서는 원래 순서)"""
+        n = len(articles)
+        if n == 0:
+            return []
+        sigs = np.stack([self.article_signature(a) for a in articles])
+        parent = list(range(n))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for band in range(self.bands):
+            rows = sigs[:, band * self.rows:(band + 1) * self.rows]
+            buckets = {}
+            for i, key in enumerate(map(bytes, rows)):
+                buckets.setdefault(key, []).append(i)
+            for members in buckets.values():
+                if len(members) < 2:
+                    continue
+                # 같은 버킷의 후보만 서명 전체로 유사도를 확인 (버킷 안에서 이미 나온 묶음의 대표와 비교)
+                heads = []
+                for i in members:
+                    for head in heads:
+                        if find(i) == find(head) or np.mean(sigs[i] == sigs[head]) >= self.threshold:
+                            parent[find(i)] = find(head)
+                            break
+                    else:
+                        heads.append(i)
+        groups = {}
+        for i in range(n):
+            groups.setdefault(find(i), []).append(i)
+        return sorted(groups.values(), key=lambda g: g[0])
+
+
+# ── 다중 키워드 매칭 ─────────────────────────────────────────
+class KeywordMatcher:
+    """키워드 목록 → 대소문자 구분 없는 부분 문자열 매처 (filter_by_keyword와 같은 기준)
+
+    실패 링크를 미리 따라가 둔 완전한 상태 전이표(DFA)라서 글자마다 dict 조회 한 번으로 진행합니다.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = list(keywords)
+        self._always = frozenset(i for i, kw in enumerate(self.keywords) if not kw)  # 빈 키워드는 모든 기사
+        goto, out = [{}], [set()]
+        for i, kw in enumerate(self.keywords):
+            state = 0
+            for ch in kw.lower():
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = goto[state][ch] = len(goto)
+                    goto.append({})
+                    out.append(set())
+                state = nxt
+            if kw:
+                out[state].add(i)
+
+        # BFS 순서로 실패 링크를 계산하면서 전이표를 완성 (부모 상태의 전이는 이미 완성돼 있음)
+        delta = [None] * len(goto)
+        fail = [0] * len(goto)
+        delta[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            out[state] |= out[fail[state]]
+            delta[state] = dict(delta[fail[state]])
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0) if state else 0
+                delta[state][ch] = nxt
+                queue.append(nxt)
+        self._delta = delta
+        self._out = [frozenset(o) for o in out]
+        self._cache = {}
+
+    def scan(self, text: str) -> frozenset:
+        """텍스트 한 번 훑기 → 들어 있는 키워드 번호 집합"""
+        delta, out = self._delta, self._out
+        state, found = 0, set(self._always)
+        for ch in text.lower():
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                found |= out[state]
+        return frozenset(found)
+
+    def article_matches(self, article: dict) -> frozenset:
+        """기사 하나의 매치 (제목과 요약은 따로 매치되도록 줄바꿈으로 구분, id별 캐시)"""
+        key, version = _article_id(article), _article_version(article)
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        found = self.scan(article["title"] + "\n" + article["summary"])
+        if len(self._cache) >= MATCH_CACHE_SIZE:
+            self._cache.clear()
+        self._cache[key] = (version, found)
+        return found
+
+    def match(self, articles: list) -> dict:
+        """기사 목록 → {키워드: 그 키워드가 든 기사 목록(원래 순서)}"""
+        result = {kw: [] for kw in self.keywords}
+        for article in articles:
+            for i in self.article_matches(article):
+                result[self.keywords[i]].append(article)
+        return result
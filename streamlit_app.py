@@ -1,92 +1,150 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import ast
 
-artists = []
-selected_year = ""
-selected_artist = ""
-search_keyword = ""
+import lyrics_search
+import lyrics_stats
+import lyrics_store
 
 # 세션 저장
 if "clicked_row" not in st.session_state:
     st.session_state.clicked_row = False
 if "last_query" not in st.session_state:
-    st.session_state.last_query = ""
+    st.session_state.last_query = None
     
 # 페이지 기본 설정(탭 제목, 아이콘, 레이아웃 등)
 st.set_page_config(
-    page_title="2019-2023 가사 검색",
+    page_title="가사 검색",
     page_icon="🚀",
     layout="centered"
 )
-    
-st.title("🚀 2019-2023 가사 검색")
+
+RESULT_CACHE_SIZE = 256  # 검색 결과 LRU 캐시 크기 (모든 세션 공유)
+PAGE_SIZE = 50           # 한 번에 브라우저로 보내는 목록 행 수
+SIMILAR_K = 5            # 비슷한 노래 개수
+TREND_WORD_CHOICES = 200 # 단어 트렌드에서 고를 수 있는 상위 단어 수
+ARTIST_ROWS = 100        # 가수별 어휘 수 표에 보여 줄 가수 수
+
+# 연도별 Arrow 파티션(메모리 맵)과 곡 테이블/필터/키워드/유사 검색 색인
+# 프로세스당 한 번 만들어 모든 세션이 공유 (cache_data는 세션마다 복사본을 만들므로 cache_resource)
+@st.cache_resource(show_spinner="가사 데이터와 검색 색인을 불러오는 중입니다...")
+def load_store():
+    return lyrics_store.LyricsStore(cache_size=RESULT_CACHE_SIZE)
+
+store = load_store()
+store.refresh()  # 새로 ingest된 연도 파티션이 있으면 그 부분만 색인에 추가
+songs = store.songs
+years = store.years()
+artists = store.artists()
+lyricists = store.lyricists()
+arrangers = store.arrangers()
+
+year_range = f"{years[0]}-{years[-1]}" if years else ""
+st.title(f"🚀 {year_range} 가사 검색")
 st.subheader("그 때 그 시절의 노래를 찾아보세요!", divider="yellow", text_alignment="center")
 st.write("")
-# 파일읽어오기
-@st.cache_data(show_spinner="CSV 파일을 불러오는 중입니다...")
-def load_data(file_path):
-    data = pd.read_csv(file_path)
-    return data
-
-df = load_data('data/lyrics_2019_2023.csv')
-years = np.arange(2019, 2024)
-with open('data/artists.txt', 'r', encoding='utf-8') as f:
-    artists_data = f.readlines()
-artists = artists_data[0].strip().split("/")
-
-col1 , col2 = st.columns(2)
-with col1:
-    selected_year = st.selectbox("년도 선택", years, index=None)
-with col2:
-    selected_artist = st.selectbox("가수 선택", artists, index=None)
-
-search_str = ""
-search_keyword = st.text_input("곡명 검색").strip()
-
-if st.button("검색"):
-    if selected_year is not None:
-        search_str = f" (year == {selected_year}) "
-    if selected_artist is not None:
-        if search_str != "":
-            search_str += " and "
-        search_str += f" (artist == '{selected_artist.strip()}') "
-    if search_keyword != "":
-        if search_str != "":
-            search_str += " and "
-        search_str += f" (lyrics.str.contains('{search_keyword}')) "
-    # st.write(search_str)
-    if search_str != "":
-        st.session_state.last_query = search_str
-        st.session_state.clicked_row = True
-    else:
-        st.warning("검색 조건을 하나 이상 선택하세요.")
-        st.session_state.clicked_row = False
-        
-if st.session_state.clicked_row:
-    filtered_df = df.query(st.session_state.last_query)
-    filtered_df = filtered_df.groupby("song_id")[["artist", "song_name","lyrics"]].max()
+
+tab_search, tab_stats = st.tabs(["🔍 가사 검색", "📊 가사 통계"])
+
+with tab_search:
+    col1 , col2 = st.columns(2)
+    with col1:
+        selected_year = st.selectbox("년도 선택", years, index=None)
+    with col2:
+        selected_artist = st.selectbox("가수 선택", artists, index=None)
+    col3 , col4 = st.columns(2)
+    with col3:
+        selected_lyricist = st.selectbox("작사가 선택", lyricists, index=None,
+                                         disabled=not store.filters.has_field("lyricist"))
+    with col4:
+        selected_arranger = st.selectbox("편곡가 선택", arrangers, index=None,
+                                         disabled=not store.filters.has_field("arranger"))
+
+    search_keyword = st.text_input("곡명 검색").strip()
+    fuzzy_mode = st.toggle("곡명 유사 검색 (초성·오타 허용, 예: ㅂㅌㅅ)")
+
+    if st.button("검색"):
+        conditions = {
+            "year": int(selected_year) if selected_year is not None else None,
+            "artist": selected_artist.strip() if selected_artist is not None else None,
+            "lyricist": selected_lyricist,
+            "arranger": selected_arranger,
+        }
+        if any(v is not None for v in conditions.values()) or search_keyword != "":
+            st.session_state.last_query = lyrics_search.normalize_query(conditions, search_keyword, fuzzy_mode)
+            st.session_state.clicked_row = True
+        else:
+            st.warning("검색 조건을 하나 이상 선택하세요.")
+            st.session_state.clicked_row = False
         
-    st.write(f"검색 결과: {len(filtered_df)}곡")
-    
-    data = st.dataframe(filtered_df,
-                 selection_mode='single-row',
-                 on_select = "rerun",
-                 use_container_width=True,
-                 key="lyrics_table")
-    
-    st.divider()
-    # # 가사 표시 로직
-    if data.selection.rows:
-        idx = data.selection.rows[0]
-        selected_song = filtered_df.iloc[idx]
-        st.subheader(f"✅ {selected_song['song_name']} 가사")
+    if st.session_state.clicked_row:
+        # 같은 조건이면 (행 클릭 rerun, 다른 세션의 같은 검색 포함) 캐시된 결과를 그대로 씀
+        query = st.session_state.last_query
+        positions = store.search(query)
+
+        # 현재 페이지의 가벼운 열(artist, song_name, year)만 보냄
+        total = len(positions)
+        n_pages = max(1, -(-total // PAGE_SIZE))
+        query_key = abs(hash(query))
+        page = st.number_input(f"페이지 (전체 {n_pages})", min_value=1, max_value=n_pages, value=1,
+                               key=f"page_{query_key}")
+        start = (page - 1) * PAGE_SIZE
+        page_positions = positions[start:start + PAGE_SIZE]
+        filtered_df = songs.take(page_positions)
+
+        st.write(f"검색 결과: {total}곡" + (f" ({start + 1}-{start + len(page_positions)})" if total else ""))
+
+        data = st.dataframe(filtered_df,
+                     selection_mode='single-row',
+                     on_select = "rerun",
+                     use_container_width=True,
+                     key=f"lyrics_table_{query_key}_{page}")
+
+        st.divider()
+        # # 가사 표시 로직
+        if data.selection.rows:
+            idx = data.selection.rows[0]
+            selected_song = filtered_df.iloc[idx]
+            st.subheader(f"✅ {selected_song['song_name']} 가사")
         
-        lyrics_lst = ast.literal_eval(selected_song['lyrics']) # 객체로 만들기
-        lyrics_lines = '<br>'.join(lyrics_lst)
-        st.markdown(f"{lyrics_lines}", unsafe_allow_html=True)
-        # st.code(lyrics_lines, language=None)
+            lyrics_lines = '<br>'.join(songs.lines(page_positions[idx])) # 선택한 곡의 가사만 꺼냄
+            st.markdown(f"{lyrics_lines}", unsafe_allow_html=True)
+            # st.code(lyrics_lines, language=None)
+
+            st.subheader("🎵 가사가 비슷한 노래")
+            similar, scores = store.similarity.top_k(page_positions[idx], SIMILAR_K)
+            st.dataframe(songs.take(similar).assign(유사도=scores.round(3)), use_container_width=True)
+        else:
+            st.info("👉 가사를 보려면 목록에서 행을 클릭하세요.")
+
+# 통계 탭: ingest 때 만들어 둔 집계 테이블(lyrics_stats)만 사용, 가사 열은 다시 훑지 않음
+with tab_stats:
+    stats = store.stats
+    if stats is None or stats.empty:
+        st.info("통계 집계가 없습니다. `python lyrics_stats.py build` 로 만들 수 있습니다.")
     else:
-        st.info("👉 가사를 보려면 목록에서 행을 클릭하세요.")
-    
+        st.subheader("📈 연도별 단어 빈도")
+        trend_words = st.multiselect("단어 선택", stats.top_words.index[:TREND_WORD_CHOICES].tolist(),
+                                     default=stats.top_words.index[:5].tolist())
+        if trend_words:
+            st.line_chart(stats.word_trend(trend_words))
+            st.caption(f"{lyrics_stats.PER_TOKENS:,}단어당 등장 횟수")
+
+        st.subheader("📏 연도별 평균 곡 길이")
+        st.bar_chart(stats.lengths["avg_tokens"].rename("곡당 평균 단어 수"))
+        st.dataframe(stats.lengths.rename(columns={
+            "songs": "곡 수", "lines": "줄 수", "tokens": "단어 수",
+            "avg_lines": "곡당 평균 줄 수", "avg_tokens": "곡당 평균 단어 수"}).round(1),
+            use_container_width=True)
+
+        st.subheader("🎤 가수별 어휘 수")
+        st.dataframe(stats.artists.head(ARTIST_ROWS).rename(columns={
+            "songs": "곡 수", "lines": "줄 수", "tokens": "단어 수",
+            "vocab": "어휘 수", "avg_tokens": "곡당 평균 단어 수"}).round(1),
+            use_container_width=True)
+
+        st.subheader("🔑 가수별 특징 단어")
+        stats_artist = st.selectbox("가수", stats.artists.index.tolist(), index=None, key="stats_artist")
+        if stats_artist is not None:
+            st.dataframe(stats.distinctive_words(stats_artist).round(4), use_container_width=True)
+
+with st.expander("🛠️ 검색 캐시 상태"):
+    st.json(store.cache.stats())
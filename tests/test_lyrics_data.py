@@ -0,0 +1,48 @@
+"""lyrics_data 변환 검증: 저장된 가사 줄이 모든 행에서 ast.literal_eval 결과와 같은지"""
+import numpy as np
+import pandas as pd
+
+import lyrics_data
+from benchmarks import synth
+
+SPECIAL_LINES = [
+    ['그가 "안녕"이라고 말했어', "쉼표, 그리고 또 쉼표,"],
+    ["it's a \"quoted\", line", "작은따옴표 ' 하나"],
+    ["'앞뒤 따옴표'", '"큰따옴표"', ", , ,"],
+]
+SPECIAL_SONGS = (1, 8, 21)
+EMPTY_SONGS = (4, 31)
+
+
+def make_csv(path) -> pd.DataFrame:
+    df = synth.make_frame(60, seed=3)
+    # 따옴표/쉼표가 든 가사와 가사가 빈(NaN) 곡을 섞음 (곡의 모든 연도 행을 같이 바꿈)
+    for song_id, lines in zip(SPECIAL_SONGS, SPECIAL_LINES):
+        df.loc[df["song_id"] == song_id, "lyrics"] = str(lines)
+    df.loc[df["song_id"].isin(EMPTY_SONGS), "lyrics"] = np.nan
+    df.to_csv(path, index=False)
+    return df
+
+
+def test_convert_matches_literal_eval(tmp_path):
+    csv_path = tmp_path / "lyrics.csv"
+    data_dir = tmp_path / "lyrics"
+    df = make_csv(csv_path)
+    paths = lyrics_data.convert_csv(str(csv_path), str(data_dir))
+    assert len(paths) == df["year"].nunique()
+    assert lyrics_data.verify(str(csv_path), str(data_dir)) == []
+
+
+def test_special_rows_round_trip(tmp_path):
+    csv_path = tmp_path / "lyrics.csv"
+    data_dir = tmp_path / "lyrics"
+    make_csv(csv_path)
+    lyrics_data.convert_csv(str(csv_path), str(data_dir))
+    songs = lyrics_data.SongTable()
+    for path in lyrics_data.list_partitions(str(data_dir)):
+        songs.append(lyrics_data.load_frame(path))
+    position = {song_id: i for i, song_id in enumerate(songs.song_ids.tolist())}
+    for song_id, lines in zip(SPECIAL_SONGS, SPECIAL_LINES):
+        assert songs.lines(position[song_id]) == lines
+    for song_id in EMPTY_SONGS:
+        assert songs.lines(position[song_id]) == []
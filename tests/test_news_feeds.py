@@ -0,0 +1,37 @@
+"""news_feeds 동시 받기: 로컬 피드 서버(지연 주입)에 대해 전체 시간과 멈춘 피드 처리를 확인"""
+import time
+
+import news_feeds
+from benchmarks.feed_server import FeedServer
+
+TIMEOUT = 2.0
+DELAYS = [0.2, 0.4, 0.6, 0.8, 1.0]   # 정상 피드 (순서대로 받으면 3초)
+STALLED = 30.0                       # timeout보다 오래 걸리는 "멈춘" 피드
+
+
+def fetch_concurrently(sources: dict) -> tuple:
+    def fetch(url, name):
+        return news_feeds.fetch_rss(url, name, timeout=TIMEOUT)
+
+    t0 = time.perf_counter()
+    results = dict(news_feeds.fetch_all(sources, fetch, timeout=TIMEOUT))
+    return results, time.perf_counter() - t0
+
+
+def test_wall_time_close_to_slowest_healthy_feed():
+    with FeedServer() as server:
+        sources = {f"feed{i}": server.url(f"feed{i}", delay=d) for i, d in enumerate(DELAYS)}
+        results, wall = fetch_concurrently(sources)
+    assert set(results) == set(sources)
+    assert all(results[name] for name in sources)
+    assert max(DELAYS) <= wall < max(DELAYS) + 0.5
+
+
+def test_stalled_feed_comes_back_empty_within_timeout():
+    with FeedServer() as server:
+        sources = {f"feed{i}": server.url(f"feed{i}", delay=d) for i, d in enumerate(DELAYS)}
+        sources["stalled"] = server.url("stalled", delay=STALLED)
+        results, wall = fetch_concurrently(sources)
+    assert results["stalled"] == []
+    assert all(results[f"feed{i}"] for i in range(len(DELAYS)))
+    assert wall < TIMEOUT + 1